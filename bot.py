@@ -1,10 +1,22 @@
 # -*- coding: utf-8 -*-
 
+import asyncio
+import bisect
 import calendar
+import contextlib
+import copy
+import functools
+import hashlib
 import json
 import os
+import signal
+import sqlite3
+import sys
+import time
 from collections import Counter
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 import discord
 from discord import app_commands
@@ -32,6 +44,38 @@ MEMBER_ROLE_NAME = "Membre"
 MONTHLY_WINNER_ROLE_NAME = "🏆 Groupe du Mois"
 MAX_GROUP_MEMBERS = 10  # Nombre maximum de membres par groupe
 
+# Rafraîchissement des messages publics : délai de regroupement et délai maximal (s)
+REFRESH_DEBOUNCE = float(os.getenv("REFRESH_DEBOUNCE", "3"))
+REFRESH_MAX_DELAY = float(os.getenv("REFRESH_MAX_DELAY", "15"))
+
+# Tâches de fond : serveurs traités en parallèle et délai maximal par serveur (s)
+GUILD_FANOUT_CONCURRENCY = int(os.getenv("GUILD_FANOUT_CONCURRENCY", "8"))
+GUILD_TASK_TIMEOUT = float(os.getenv("GUILD_TASK_TIMEOUT", "120"))
+
+# Modifications de rôles en masse : membres traités en parallèle et nouvelles tentatives
+ROLE_EDIT_CONCURRENCY = int(os.getenv("ROLE_EDIT_CONCURRENCY", "4"))
+API_RETRIES = int(os.getenv("API_RETRIES", "3"))
+
+# Suppression des groupes vides : salons supprimés en parallèle, et délai (s) avant
+# qu'une catégorie de groupe sans membres soit considérée comme orpheline
+TEARDOWN_CONCURRENCY = int(os.getenv("TEARDOWN_CONCURRENCY", "4"))
+TEARDOWN_GRACE = float(os.getenv("TEARDOWN_GRACE", "600"))
+
+# Sharding : SHARD_COUNT = nombre total de shards ("auto" : choisi par Discord).
+# SHARD_IDS = shards gérés par ce processus (ex. "0,1"), pour répartir les shards
+# entre plusieurs processus lancés avec le même SHARD_COUNT (ex. SHARD_COUNT=4
+# SHARD_IDS=0,1 python bot.py, puis SHARD_IDS=2,3 dans un second worker).
+SHARD_COUNT = os.getenv("SHARD_COUNT", "").strip().lower()
+SHARD_IDS = [int(i) for i in os.getenv("SHARD_IDS", "").split(",") if i.strip()] or None
+
+# Planification (format cron : minute heure jour mois jour-de-semaine, 0 = dimanche)
+BOT_TIMEZONE = os.getenv("BOT_TIMEZONE", "Europe/Paris")
+WEEKLY_VOTE_CRON = os.getenv("WEEKLY_VOTE_CRON", "0 18 * * 3")  # Mercredi 18h
+WINNER_CRON = os.getenv("WINNER_CRON", "0 20 * * 5")  # Vendredi 20h
+MONTHLY_EVENT_CRON = os.getenv("MONTHLY_EVENT_CRON", "0 12 1 * *")  # Le 1er à midi
+# Une échéance manquée (bot arrêté) est rattrapée si elle date de moins de N secondes
+CRON_CATCHUP_WINDOW = float(os.getenv("CRON_CATCHUP_WINDOW", "21600"))
+
 
 # --- Gestion de la base de données (JSON) ---
 def load_data(file_name):
@@ -39,14 +83,97 @@ def load_data(file_name):
     try:
         with open(file_name, "r", encoding="utf-8") as f:
             return json.load(f)
-    except (FileNotFoundError, json.JSONDecodeError):
+    except FileNotFoundError:
+        return {}
+    except json.JSONDecodeError as e:
+        # On met le fichier illisible de côté plutôt que de l'écraser au prochain flush
+        corrupt_name = f"{file_name}.corrupt-{datetime.now():%Y%m%d%H%M%S}"
+        os.replace(file_name, corrupt_name)
+        print(f"Erreur : {file_name} est illisible ({e}), déplacé vers {corrupt_name}.")
         return {}
 
 
 def save_data(data, file_name):
-    """Sauvegarde les données dans un fichier JSON."""
-    with open(file_name, "w", encoding="utf-8") as f:
+    """Sauvegarde les données dans un fichier JSON (écriture atomique)."""
+    tmp_name = f"{file_name}.tmp"
+    with open(tmp_name, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=4, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_name, file_name)
+
+
+# Pool de threads dédié aux lectures/écritures de fichiers
+DATA_IO_WORKERS = int(os.getenv("DATA_IO_WORKERS", "4"))
+io_executor = ThreadPoolExecutor(
+    max_workers=DATA_IO_WORKERS, thread_name_prefix="data-io"
+)
+_io_locks = {}
+
+
+async def run_io(func, *args):
+    """Exécute une fonction bloquante dans le pool d'E/S."""
+    return await asyncio.get_running_loop().run_in_executor(io_executor, func, *args)
+
+
+async def load_data_async(file_name):
+    """Version asynchrone de load_data, exécutée dans le pool d'E/S."""
+    return await run_io(load_data, file_name)
+
+
+def save_data_async(data, file_name):
+    """Version asynchrone de save_data ; renvoie une tâche à attendre.
+
+    Une copie des données est prise immédiatement ; la sérialisation et
+    l'écriture se font en une passe dans le pool d'E/S. Les écritures d'un
+    même fichier sont appliquées dans l'ordre des appels.
+    """
+    snapshot = copy.deepcopy(data)
+    return asyncio.ensure_future(_write_data_ordered(snapshot, file_name))
+
+
+async def _write_data_ordered(data, file_name):
+    lock = _io_locks.setdefault(file_name, asyncio.Lock())
+    async with lock:
+        await run_io(save_data, data, file_name)
+
+
+def apply_change(data, op, path, value=None):
+    """Applique une modification élémentaire ("set" ou "del") à un chemin de clés."""
+    for key in path[:-1]:
+        data = data.setdefault(key, {})
+    if op == "set":
+        data[path[-1]] = value
+    else:
+        data.pop(path[-1], None)
+
+
+class RankedIndex:
+    """Classement maintenu trié (score décroissant) par insertion dichotomique."""
+
+    def __init__(self, scores=()):
+        self._scores = dict(scores)
+        self._order = sorted((-score, key) for key, score in self._scores.items())
+
+    def __len__(self):
+        return len(self._order)
+
+    def score(self, key, default=0):
+        return self._scores.get(key, default)
+
+    def update(self, key, score):
+        self.remove(key)
+        self._scores[key] = score
+        bisect.insort(self._order, (-score, key))
+
+    def remove(self, key):
+        score = self._scores.pop(key, None)
+        if score is not None:
+            del self._order[bisect.bisect_left(self._order, (-score, key))]
+
+    def top(self, n=None):
+        """Les n premières clés (toutes si n vaut None)."""
+        return [key for _, key in self._order[:n]]
 
 
 # Noms des fichiers de données
@@ -54,6 +181,1107 @@ recommendations_db = "recommendations.json"
 events_db = "events.json"
 group_scores_db = "group_scores.json"
 weekly_votes_db = "weekly_votes.json"
+registry_db = "registry.json"
+
+# Écriture différée : intervalle (secondes) et nombre de modifications avant flush
+DATA_FLUSH_INTERVAL = float(os.getenv("DATA_FLUSH_INTERVAL", "10"))
+DATA_FLUSH_THRESHOLD = int(os.getenv("DATA_FLUSH_THRESHOLD", "50"))
+
+# Bulletins du vote hebdomadaire : écrits par lots de N ou après un court délai
+BALLOT_BATCH_SIZE = int(os.getenv("BALLOT_BATCH_SIZE", "50"))
+BALLOT_FLUSH_DELAY = float(os.getenv("BALLOT_FLUSH_DELAY", "0.25"))
+
+# Stockage : "json" (fichiers ci-dessus), "journal", "sharded" ou "sqlite"
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json").lower()
+DATA_JOURNAL_FILE = os.getenv("DATA_JOURNAL_FILE", "data.journal")
+# Taille du journal (octets) au-delà de laquelle on réécrit les fichiers
+DATA_JOURNAL_MAX_BYTES = int(os.getenv("DATA_JOURNAL_MAX_BYTES", "1048576"))
+DATA_COMPACT_INTERVAL = float(os.getenv("DATA_COMPACT_INTERVAL", "600"))
+# Mode "sharded" : un dossier par serveur, déchargé après inactivité (secondes)
+DATA_DIR = os.getenv("DATA_DIR", "data")
+DATA_IDLE_TIMEOUT = float(os.getenv("DATA_IDLE_TIMEOUT", "1800"))
+SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "cerber.db")
+# Attente maximale (ms) d'un verrou SQLite tenu par un autre processus. Les
+# requêtes s'exécutent sur la boucle asyncio : l'attente doit rester courte.
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "100"))
+# Empreinte des commandes slash déjà synchronisées avec Discord
+COMMANDS_STATE_FILE = os.getenv("COMMANDS_STATE_FILE", "commands.json")
+
+
+class StoreBase:
+    """Verrous par serveur, communs à tous les types de stockage."""
+
+    def __init__(self):
+        self._guild_locks = {}
+        self._events_versions = Counter()
+
+    def events_version(self, guild_id):
+        """Compteur (en mémoire) des ajouts et changements de statut d'événements."""
+        return self._events_versions[str(guild_id)]
+
+    def _bump_events(self, guild_id):
+        self._events_versions[str(guild_id)] += 1
+
+    async def warm(self, guild_id):
+        """Précharge les données d'un serveur (rien à faire par défaut)."""
+
+    @contextlib.asynccontextmanager
+    async def transaction(self, guild_id):
+        """Sérialise les séquences lecture → décision → écriture d'un serveur.
+
+        S'utilise avec `async with store.transaction(guild.id) as data:` ; le
+        bloc ne doit contenir aucun appel à l'API Discord, pour que le verrou
+        ne soit tenu que le temps des accès aux données.
+        """
+        lock = self._guild_locks.setdefault(str(guild_id), asyncio.Lock())
+        async with lock:
+            await self.warm(guild_id)
+            yield self
+
+
+class JsonStore(StoreBase):
+    """Garde les fichiers JSON en mémoire et les écrit sur disque en arrière-plan."""
+
+    def __init__(self, file_names, flush_interval, flush_threshold):
+        super().__init__()
+        self.file_names = list(file_names)
+        self.flush_interval = flush_interval
+        self.flush_threshold = flush_threshold
+        self._data = {}
+        self._dirty = {}
+        self._rankings = {}  # server_id -> RankedIndex des événements actifs
+        self._rater_rankings = {}  # server_id -> RankedIndex des notes par membre
+        self._score_rankings = {}  # server_id -> RankedIndex des scores de groupe
+        self._wakeup = None
+        self._task = None
+
+    def load(self):
+        """Charge tous les fichiers une seule fois, au démarrage."""
+        for file_name in self.file_names:
+            self._data[file_name] = load_data(file_name)
+        self._dirty.clear()
+
+    def get(self, file_name):
+        """Renvoie les données en mémoire d'un fichier (à ne pas réassigner)."""
+        if file_name not in self._data:
+            self._data[file_name] = load_data(file_name)
+        return self._data[file_name]
+
+    def mark_dirty(self, file_name, *changes):
+        """Signale une modification ; déclenche un flush anticipé au-delà du seuil.
+
+        `changes` décrit la modification sous forme de tuples (op, chemin[, valeur])
+        pour le mode journalisé ; le flush complet n'en a pas besoin.
+        """
+        self._dirty[file_name] = self._dirty.get(file_name, 0) + 1
+        if (
+            self._wakeup is not None
+            and sum(self._dirty.values()) >= self.flush_threshold
+        ):
+            self._wakeup.set()
+
+    def flush(self):
+        """Écrit sur disque les fichiers modifiés depuis le dernier flush."""
+        dirty, self._dirty = self._dirty, {}
+        for file_name in dirty:
+            try:
+                save_data(self._data[file_name], file_name)
+            except OSError as e:
+                print(f"Erreur lors de l'écriture de {file_name} : {e}")
+                self._dirty.setdefault(file_name, dirty[file_name])
+
+    async def flush_async(self):
+        """Comme flush, mais l'écriture passe par le pool d'E/S.
+
+        Renvoie False si au moins un fichier n'a pas pu être écrit.
+        """
+        dirty, self._dirty = self._dirty, {}
+        writes = [
+            save_data_async(self._data[file_name], file_name) for file_name in dirty
+        ]
+        try:
+            results = await asyncio.gather(*writes, return_exceptions=True)
+        except asyncio.CancelledError:
+            # Arrêt du bot : le flush final de __main__ réécrira ces fichiers
+            for file_name, count in dirty.items():
+                self._dirty[file_name] = self._dirty.get(file_name, 0) + count
+            raise
+        success = True
+        for file_name, result in zip(dirty, results):
+            if isinstance(result, BaseException):
+                print(f"Erreur lors de l'écriture de {file_name} : {result}")
+                self._dirty[file_name] = (
+                    self._dirty.get(file_name, 0) + dirty[file_name]
+                )
+                success = False
+        return success
+
+    def start(self):
+        """Lance la tâche de flush périodique (une seule fois)."""
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush_async()
+
+    def _guild(self, file_name, guild_id, create=False):
+        data = self.get(file_name)
+        server_id = str(guild_id)
+        if create and server_id not in data:
+            data[server_id] = {}
+        return data.get(server_id, {})
+
+    def _votes(self, guild_id):
+        # Le fichier des votes n'est pas découpé par serveur
+        return self.get(weekly_votes_db)
+
+    def _touch(self, file_name, guild_id, *changes):
+        self.mark_dirty(file_name, *changes)
+
+    # --- Événements ---
+    def get_event(self, guild_id, event_id):
+        return self._guild(events_db, guild_id).get(event_id)
+
+    @staticmethod
+    def _ensure_aggregates(event):
+        # Les anciens événements n'ont pas encore de somme/compteur de notes
+        if "rating_count" not in event:
+            event["rating_sum"] = sum(event["ratings"].values())
+            event["rating_count"] = len(event["ratings"])
+        return event
+
+    def _ranking(self, guild_id):
+        """Classement des événements actifs du serveur, construit au premier usage."""
+        server_id = str(guild_id)
+        if server_id not in self._rankings:
+            self._rankings[server_id] = RankedIndex(
+                (event_id, self._ensure_aggregates(event)["average_rating"])
+                for event_id, event in self._guild(events_db, guild_id).items()
+                if event.get("status") == "active"
+            )
+        return self._rankings[server_id]
+
+    def _update_ranking(self, guild_id, event_id, event):
+        ranking = self._rankings.get(str(guild_id))
+        if ranking is None:
+            return
+        if event.get("status") == "active":
+            ranking.update(event_id, event["average_rating"])
+        else:
+            ranking.remove(event_id)
+
+    def _raters(self, guild_id):
+        """Nombre de notes données par membre, construit au premier usage."""
+        server_id = str(guild_id)
+        if server_id not in self._rater_rankings:
+            self._rater_rankings[server_id] = RankedIndex(
+                Counter(
+                    user_id
+                    for event in self._guild(events_db, guild_id).values()
+                    for user_id in event.get("ratings", {})
+                )
+            )
+        return self._rater_rankings[server_id]
+
+    def add_event(self, guild_id, event_id, event):
+        self._ensure_aggregates(event)
+        events = self._guild(events_db, guild_id, create=True)
+        if event["ratings"] or event_id in events:
+            # Cas des imports : on recompte plutôt que d'ajuster
+            self._rater_rankings.pop(str(guild_id), None)
+        events[event_id] = event
+        self._update_ranking(guild_id, event_id, event)
+        self._bump_events(guild_id)
+        self._touch(events_db, guild_id, ("set", [str(guild_id), event_id], event))
+
+    def rate_event(self, guild_id, event_id, user_id, note):
+        """Enregistre la note d'un membre et renvoie l'événement mis à jour."""
+        event = self.get_event(guild_id, event_id)
+        if event is None:
+            return None
+        self._ensure_aggregates(event)
+        previous = event["ratings"].get(str(user_id))
+        event["ratings"][str(user_id)] = note
+        if previous is None:
+            event["rating_count"] += 1
+            event["rating_sum"] += note
+            raters = self._rater_rankings.get(str(guild_id))
+            if raters is not None:
+                raters.update(str(user_id), raters.score(str(user_id)) + 1)
+        else:
+            event["rating_sum"] += note - previous
+        event["average_rating"] = round(event["rating_sum"] / event["rating_count"], 2)
+        self._update_ranking(guild_id, event_id, event)
+        path = [str(guild_id), event_id]
+        self._touch(
+            events_db,
+            guild_id,
+            ("set", path + ["ratings", str(user_id)], note),
+            ("set", path + ["rating_sum"], event["rating_sum"]),
+            ("set", path + ["rating_count"], event["rating_count"]),
+            ("set", path + ["average_rating"], event["average_rating"]),
+        )
+        return event
+
+    def set_event_status(self, guild_id, event_id, status):
+        event = self.get_event(guild_id, event_id)
+        if event is None:
+            return False
+        event["status"] = status
+        self._update_ranking(guild_id, event_id, event)
+        self._bump_events(guild_id)
+        self._touch(
+            events_db, guild_id, ("set", [str(guild_id), event_id, "status"], status)
+        )
+        return True
+
+    def active_events(self, guild_id, limit=None):
+        """Événements actifs triés par note moyenne décroissante."""
+        events = self._guild(events_db, guild_id)
+        return [
+            (event_id, events[event_id])
+            for event_id in self._ranking(guild_id).top(limit)
+        ]
+
+    def events_in_month(self, guild_id, year, month, status="validated"):
+        prefix = f"{year:04d}-{month:02d}-"
+        return [
+            (event_id, event)
+            for event_id, event in self._guild(events_db, guild_id).items()
+            if event.get("status") == status
+            and (event.get("date") or "").startswith(prefix)
+        ]
+
+    def rater_counts(self, guild_id, limit):
+        """Membres ayant donné le plus de notes : [(user_id, nombre), ...]."""
+        raters = self._raters(guild_id)
+        return [(user_id, raters.score(user_id)) for user_id in raters.top(limit)]
+
+    # --- Recommandations ---
+    def get_recommendation(self, guild_id, member_id):
+        return self._guild(recommendations_db, guild_id).get(str(member_id))
+
+    def add_recommendation(self, guild_id, member_id, info):
+        self._guild(recommendations_db, guild_id, create=True)[str(member_id)] = info
+        self._touch(
+            recommendations_db,
+            guild_id,
+            ("set", [str(guild_id), str(member_id)], info),
+        )
+
+    def remove_recommendation(self, guild_id, member_id):
+        """Supprime une recommandation ; renvoie False si elle n'existait pas."""
+        recommendations = self._guild(recommendations_db, guild_id)
+        if recommendations.pop(str(member_id), None) is None:
+            return False
+        self._touch(
+            recommendations_db, guild_id, ("del", [str(guild_id), str(member_id)])
+        )
+        return True
+
+    # --- Votes hebdomadaires ---
+    def record_ballots(self, guild_id, vote_id, ballots):
+        """Enregistre un lot de bulletins {user_id: event_id} pour un vote."""
+        self._votes(guild_id).setdefault(vote_id, {}).update(ballots)
+        changes = [
+            ("set", [vote_id, user_id], event_id)
+            for user_id, event_id in ballots.items()
+        ]
+        self._touch(weekly_votes_db, guild_id, *changes)
+
+    def latest_vote(self, guild_id):
+        """Renvoie (vote_id, bulletins) du dernier vote du serveur, ou None.
+
+        Le fichier des votes est commun à tous les serveurs : un vote appartient
+        au serveur des événements pour lesquels on a voté (cf. vote_guilds).
+        """
+        events = self._guild(events_db, guild_id)
+        votes_data = {
+            vote_id: ballots
+            for vote_id, ballots in self._votes(guild_id).items()
+            if any(event_id in events for event_id in ballots.values())
+        }
+        if not votes_data:
+            return None
+        latest_vote_id = sorted(votes_data.keys())[-1]
+        return latest_vote_id, votes_data[latest_vote_id]
+
+    def delete_vote(self, guild_id, vote_id):
+        if self._votes(guild_id).pop(vote_id, None) is not None:
+            self._touch(weekly_votes_db, guild_id, ("del", [vote_id]))
+
+    # --- Scores des groupes ---
+    def group_scores(self, guild_id):
+        return dict(self._guild(group_scores_db, guild_id))
+
+    def top_group_scores(self, guild_id, limit):
+        """Groupes les mieux classés : [(nom, score), ...]."""
+        server_id = str(guild_id)
+        if server_id not in self._score_rankings:
+            self._score_rankings[server_id] = RankedIndex(
+                self._guild(group_scores_db, guild_id)
+            )
+        ranking = self._score_rankings[server_id]
+        return [(name, ranking.score(name)) for name in ranking.top(limit)]
+
+    def increment_group_score(self, guild_id, group_name, amount=1):
+        scores = self._guild(group_scores_db, guild_id, create=True)
+        scores[group_name] = scores.get(group_name, 0) + amount
+        ranking = self._score_rankings.get(str(guild_id))
+        if ranking is not None:
+            ranking.update(group_name, scores[group_name])
+        self._touch(
+            group_scores_db,
+            guild_id,
+            ("set", [str(guild_id), group_name], scores[group_name]),
+        )
+
+    def reset_group_scores(self, guild_id):
+        self._guild(group_scores_db, guild_id, create=True).clear()
+        self._score_rankings.pop(str(guild_id), None)
+        self._touch(group_scores_db, guild_id, ("set", [str(guild_id)], {}))
+
+    # --- Registre (messages du bot, etc.) ---
+    def get_entry(self, guild_id, kind, key):
+        return self._guild(registry_db, guild_id).get(kind, {}).get(key)
+
+    def entries(self, guild_id, kind):
+        return dict(self._guild(registry_db, guild_id).get(kind, {}))
+
+    def set_entry(self, guild_id, kind, key, value):
+        registry = self._guild(registry_db, guild_id, create=True)
+        registry.setdefault(kind, {})[key] = value
+        self._touch(registry_db, guild_id, ("set", [str(guild_id), kind, key], value))
+
+    def delete_entry(self, guild_id, kind, key):
+        if self._guild(registry_db, guild_id).get(kind, {}).pop(key, None) is not None:
+            self._touch(registry_db, guild_id, ("del", [str(guild_id), kind, key]))
+
+
+class ShardedStore(JsonStore):
+    """Variante de JsonStore avec un dossier de fichiers par serveur.
+
+    Les fichiers d'un serveur ne sont lus qu'au premier accès et sont retirés
+    de la mémoire après DATA_IDLE_TIMEOUT secondes d'inactivité.
+    """
+
+    def __init__(
+        self, file_names, data_dir, flush_interval, flush_threshold, idle_timeout
+    ):
+        super().__init__(file_names, flush_interval, flush_threshold)
+        self.data_dir = data_dir
+        self.idle_timeout = idle_timeout
+        self._loaded = {}  # server_id -> chemins chargés en mémoire
+        self._last_used = {}
+
+    def load(self):
+        os.makedirs(self.data_dir, exist_ok=True)
+
+    def _path(self, guild_id, file_name):
+        return os.path.join(self.data_dir, str(guild_id), file_name)
+
+    def _guild(self, file_name, guild_id, create=False):
+        server_id = str(guild_id)
+        path = self._path(server_id, file_name)
+        self._last_used[server_id] = time.monotonic()
+        self._loaded.setdefault(server_id, set()).add(path)
+        return self.get(path)
+
+    def _votes(self, guild_id):
+        return self._guild(weekly_votes_db, guild_id)
+
+    async def warm(self, guild_id):
+        """Charge les fichiers du serveur via le pool d'E/S, sans bloquer la boucle."""
+        server_id = str(guild_id)
+        missing = [
+            path
+            for path in (self._path(server_id, name) for name in self.file_names)
+            if path not in self._data
+        ]
+        loaded = await asyncio.gather(*(load_data_async(path) for path in missing))
+        for path, data in zip(missing, loaded):
+            self._data.setdefault(path, data)
+            self._loaded.setdefault(server_id, set()).add(path)
+        self._last_used[server_id] = time.monotonic()
+
+    def _touch(self, file_name, guild_id, *changes):
+        self.mark_dirty(self._path(guild_id, file_name))
+
+    def flush(self):
+        self._make_dirs(list(self._dirty))
+        super().flush()
+        self.evict_idle()
+
+    async def flush_async(self):
+        success = True
+        if self._dirty:
+            await run_io(self._make_dirs, list(self._dirty))
+            success = await super().flush_async()
+        self.evict_idle()
+        return success
+
+    @staticmethod
+    def _make_dirs(paths):
+        for path in paths:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def evict_idle(self):
+        """Décharge les serveurs inactifs dont tout est déjà écrit sur disque."""
+        deadline = time.monotonic() - self.idle_timeout
+        for server_id, last_used in list(self._last_used.items()):
+            paths = self._loaded[server_id]
+            if last_used > deadline or any(path in self._dirty for path in paths):
+                continue
+            for path in paths:
+                self._data.pop(path, None)
+            self._rankings.pop(server_id, None)
+            self._rater_rankings.pop(server_id, None)
+            self._score_rankings.pop(server_id, None)
+            del self._loaded[server_id]
+            del self._last_used[server_id]
+
+
+class JournaledStore(JsonStore):
+    """Variante de JsonStore qui journalise chaque modification.
+
+    Chaque mutation ajoute une ligne au journal ; les fichiers JSON servent
+    d'instantanés et ne sont réécrits (atomiquement) qu'au compactage. Le
+    compactage archive d'abord le journal en un segment numéroté, qui n'est
+    supprimé qu'une fois les instantanés écrits. Au démarrage : instantanés,
+    puis rejeu des segments restants et du journal.
+    """
+
+    def __init__(self, file_names, journal_file, max_journal_bytes, compact_interval):
+        super().__init__(file_names, compact_interval, flush_threshold=0)
+        self.journal_file = journal_file
+        self.max_journal_bytes = max_journal_bytes
+        self._journal = None
+        self._segment_seq = 0
+
+    def _segments(self):
+        directory = os.path.dirname(self.journal_file) or "."
+        prefix = os.path.basename(self.journal_file) + "."
+        segments = [
+            (int(name[len(prefix) :]), os.path.join(directory, name))
+            for name in os.listdir(directory)
+            if name.startswith(prefix) and name[len(prefix) :].isdigit()
+        ]
+        return [path for _, path in sorted(segments)]
+
+    def _replay(self, journal_file):
+        replayed = damaged = 0
+        try:
+            with open(journal_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Dernière ligne tronquée par un arrêt brutal : on l'ignore
+                        print(f"Entrée de journal illisible ignorée : {line[:80]!r}")
+                        damaged += 1
+                        continue
+                    apply_change(
+                        self.get(record["f"]),
+                        record["op"],
+                        record["p"],
+                        record.get("v"),
+                    )
+                    self._dirty[record["f"]] = self._dirty.get(record["f"], 0) + 1
+                    replayed += 1
+        except FileNotFoundError:
+            pass
+        return replayed, damaged
+
+    def load(self):
+        super().load()
+        segments = self._segments()
+        replayed = damaged = 0
+        for journal_file in segments + [self.journal_file]:
+            counts = self._replay(journal_file)
+            replayed, damaged = replayed + counts[0], damaged + counts[1]
+        if segments:
+            self._segment_seq = int(segments[-1].rsplit(".", 1)[1])
+        self._journal = open(self.journal_file, "a", encoding="utf-8")
+        if replayed:
+            print(f"{replayed} modification(s) rejouée(s) depuis {self.journal_file}.")
+        if replayed or damaged:
+            self.flush()
+
+    def mark_dirty(self, file_name, *changes):
+        self._dirty[file_name] = self._dirty.get(file_name, 0) + 1
+        if self._journal is None:
+            return
+        for op, path, *value in changes:
+            record = {"f": file_name, "op": op, "p": path}
+            if value:
+                record["v"] = value[0]
+            self._journal.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._journal.flush()
+        if self._wakeup is not None and self._journal.tell() >= self.max_journal_bytes:
+            self._wakeup.set()
+
+    def flush(self):
+        """Compacte de façon synchrone (démarrage, arrêt) et vide tout le journal."""
+        super().flush()
+        if self._dirty:
+            return  # Un instantané a échoué : on garde le journal pour le rejeu
+        for segment in self._segments():
+            os.remove(segment)
+        if self._journal is not None and self._journal.tell():
+            self._journal.seek(0)
+            self._journal.truncate()
+
+    async def flush_async(self):
+        """Compacte en arrière-plan : archive le journal puis écrit les instantanés."""
+        if not self._dirty:
+            return True
+        # L'archivage et la prise des instantanés se font sans await entre eux :
+        # toute modification ultérieure ira dans le nouveau journal.
+        self._segment_seq += 1
+        segment = f"{self.journal_file}.{self._segment_seq}"
+        self._journal.close()
+        os.replace(self.journal_file, segment)
+        self._journal = open(self.journal_file, "a", encoding="utf-8")
+        if not await super().flush_async():
+            return False
+        for old_segment in self._segments():
+            if int(old_segment.rsplit(".", 1)[1]) <= self._segment_seq:
+                await run_io(os.remove, old_segment)
+        return True
+
+
+# --- Stockage SQLite (optionnel) ---
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    guild_id INTEGER NOT NULL,
+    event_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    category TEXT,
+    proposer_group TEXT NOT NULL,
+    average_rating REAL NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
+    rating_count INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    date TEXT,
+    PRIMARY KEY (guild_id, event_id)
+);
+CREATE INDEX IF NOT EXISTS idx_events_status
+    ON events (guild_id, status, average_rating DESC);
+CREATE INDEX IF NOT EXISTS idx_events_date ON events (guild_id, date);
+
+CREATE TABLE IF NOT EXISTS ratings (
+    guild_id INTEGER NOT NULL,
+    event_id TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    note INTEGER NOT NULL,
+    PRIMARY KEY (guild_id, event_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS idx_ratings_user ON ratings (guild_id, user_id);
+
+CREATE TABLE IF NOT EXISTS rater_counts (
+    guild_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS idx_rater_counts ON rater_counts (guild_id, count DESC);
+
+CREATE TABLE IF NOT EXISTS votes (
+    vote_id INTEGER PRIMARY KEY,
+    guild_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_votes_guild ON votes (guild_id, vote_id);
+
+CREATE TABLE IF NOT EXISTS ballots (
+    vote_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    event_id TEXT NOT NULL,
+    PRIMARY KEY (vote_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS idx_ballots_vote ON ballots (vote_id);
+
+CREATE TABLE IF NOT EXISTS group_scores (
+    guild_id INTEGER NOT NULL,
+    group_name TEXT NOT NULL,
+    score INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, group_name)
+);
+CREATE INDEX IF NOT EXISTS idx_group_scores_rank
+    ON group_scores (guild_id, score DESC);
+
+CREATE TABLE IF NOT EXISTS recommendations (
+    guild_id INTEGER NOT NULL,
+    member_id INTEGER NOT NULL,
+    recommender_id INTEGER NOT NULL,
+    timestamp TEXT NOT NULL,
+    PRIMARY KEY (guild_id, member_id)
+);
+
+CREATE TABLE IF NOT EXISTS registry (
+    guild_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (guild_id, kind, key)
+);
+"""
+
+
+class SQLiteStore(StoreBase):
+    """Stockage SQLite (mode WAL) : requêtes indexées et mises à jour ligne à ligne."""
+
+    def __init__(self, db_path):
+        super().__init__()
+        self.db_path = db_path
+        self._conn = None
+
+    def load(self):
+        # Plusieurs processus (shards) peuvent écrire : attente brève du verrou
+        self._conn = sqlite3.connect(
+            self.db_path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000
+        )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        has_rater_counts = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'rater_counts'"
+        ).fetchone()
+        self._conn.executescript(SQLITE_SCHEMA)
+        if not has_rater_counts:
+            # Base créée avant les compteurs de notes : on les calcule une fois
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO rater_counts (guild_id, user_id, count)"
+                    " SELECT guild_id, user_id, COUNT(*) FROM ratings"
+                    " GROUP BY guild_id, user_id"
+                )
+        columns = [
+            row["name"] for row in self._conn.execute("PRAGMA table_info(events)")
+        ]
+        if "rating_count" not in columns:
+            # Base créée avant les agrégats : on ajoute et remplit les colonnes
+            with self._conn:
+                for column in ("rating_sum", "rating_count"):
+                    self._conn.execute(
+                        f"ALTER TABLE events ADD COLUMN {column}"
+                        " INTEGER NOT NULL DEFAULT 0"
+                    )
+                self._conn.execute(
+                    "UPDATE events SET (rating_sum, rating_count) = ("
+                    " SELECT COALESCE(SUM(note), 0), COUNT(*) FROM ratings r"
+                    " WHERE r.guild_id = events.guild_id"
+                    " AND r.event_id = events.event_id)"
+                )
+
+    def start(self):
+        """Rien à faire : chaque écriture est validée immédiatement."""
+
+    def flush(self):
+        if self._conn is not None:
+            self._conn.commit()
+
+    async def flush_async(self):
+        self.flush()
+        return True
+
+    @staticmethod
+    def _event_from_row(row):
+        return {
+            "title": row["title"],
+            "category": row["category"],
+            "proposer_group": row["proposer_group"],
+            "average_rating": row["average_rating"],
+            "rating_sum": row["rating_sum"],
+            "rating_count": row["rating_count"],
+            "status": row["status"],
+            "date": row["date"],
+        }
+
+    # --- Événements ---
+    def get_event(self, guild_id, event_id):
+        row = self._conn.execute(
+            "SELECT * FROM events WHERE guild_id = ? AND event_id = ?",
+            (guild_id, event_id),
+        ).fetchone()
+        return self._event_from_row(row) if row else None
+
+    def add_event(self, guild_id, event_id, event):
+        ratings = event.get("ratings", {})
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO events (guild_id, event_id, title, category,"
+                " proposer_group, average_rating, rating_sum, rating_count, status,"
+                " date) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    guild_id,
+                    event_id,
+                    event["title"],
+                    event.get("category"),
+                    event["proposer_group"],
+                    event.get("average_rating", 0.0),
+                    sum(ratings.values()),
+                    len(ratings),
+                    event["status"],
+                    event.get("date"),
+                ),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ratings (guild_id, event_id, user_id, note)"
+                " VALUES (?, ?, ?, ?)",
+                [
+                    (guild_id, event_id, int(user_id), note)
+                    for user_id, note in event.get("ratings", {}).items()
+                ],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO rater_counts (guild_id, user_id, count)"
+                " SELECT ?, ?, COUNT(*) FROM ratings"
+                " WHERE guild_id = ? AND user_id = ?",
+                [
+                    (guild_id, int(user_id), guild_id, int(user_id))
+                    for user_id in ratings
+                ],
+            )
+        self._bump_events(guild_id)
+
+    def rate_event(self, guild_id, event_id, user_id, note):
+        with self._conn:
+            event = self.get_event(guild_id, event_id)
+            if event is None:
+                return None
+            previous = self._conn.execute(
+                "SELECT note FROM ratings"
+                " WHERE guild_id = ? AND event_id = ? AND user_id = ?",
+                (guild_id, event_id, user_id),
+            ).fetchone()
+            if previous is None:
+                event["rating_count"] += 1
+                event["rating_sum"] += note
+                self._conn.execute(
+                    "INSERT INTO rater_counts (guild_id, user_id, count)"
+                    " VALUES (?, ?, 1)"
+                    " ON CONFLICT (guild_id, user_id) DO UPDATE SET count = count + 1",
+                    (guild_id, user_id),
+                )
+            else:
+                event["rating_sum"] += note - previous["note"]
+            event["average_rating"] = round(
+                event["rating_sum"] / event["rating_count"], 2
+            )
+            self._conn.execute(
+                "INSERT INTO ratings (guild_id, event_id, user_id, note)"
+                " VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (guild_id, event_id, user_id)"
+                " DO UPDATE SET note = excluded.note",
+                (guild_id, event_id, user_id, note),
+            )
+            self._conn.execute(
+                "UPDATE events SET rating_sum = ?, rating_count = ?, average_rating = ?"
+                " WHERE guild_id = ? AND event_id = ?",
+                (
+                    event["rating_sum"],
+                    event["rating_count"],
+                    event["average_rating"],
+                    guild_id,
+                    event_id,
+                ),
+            )
+        return event
+
+    def set_event_status(self, guild_id, event_id, status):
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE events SET status = ? WHERE guild_id = ? AND event_id = ?",
+                (status, guild_id, event_id),
+            )
+        self._bump_events(guild_id)
+        return cursor.rowcount > 0
+
+    def active_events(self, guild_id, limit=None):
+        rows = self._conn.execute(
+            "SELECT * FROM events WHERE guild_id = ? AND status = 'active'"
+            " ORDER BY average_rating DESC, event_id LIMIT ?",
+            (guild_id, -1 if limit is None else limit),
+        )
+        return [(row["event_id"], self._event_from_row(row)) for row in rows]
+
+    def events_in_month(self, guild_id, year, month, status="validated"):
+        start = f"{year:04d}-{month:02d}-01"
+        end = f"{year + month // 12:04d}-{month % 12 + 1:02d}-01"
+        rows = self._conn.execute(
+            "SELECT * FROM events WHERE guild_id = ? AND date >= ? AND date < ?"
+            " AND status = ?",
+            (guild_id, start, end, status),
+        )
+        return [(row["event_id"], self._event_from_row(row)) for row in rows]
+
+    def rater_counts(self, guild_id, limit):
+        rows = self._conn.execute(
+            "SELECT user_id, count FROM rater_counts WHERE guild_id = ?"
+            " ORDER BY count DESC, user_id LIMIT ?",
+            (guild_id, limit),
+        )
+        return [(str(row["user_id"]), row["count"]) for row in rows]
+
+    # --- Recommandations ---
+    def get_recommendation(self, guild_id, member_id):
+        row = self._conn.execute(
+            "SELECT recommender_id, timestamp FROM recommendations"
+            " WHERE guild_id = ? AND member_id = ?",
+            (guild_id, int(member_id)),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def add_recommendation(self, guild_id, member_id, info):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO recommendations"
+                " (guild_id, member_id, recommender_id, timestamp) VALUES (?, ?, ?, ?)",
+                (guild_id, int(member_id), info["recommender_id"], info["timestamp"]),
+            )
+
+    def remove_recommendation(self, guild_id, member_id):
+        with self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM recommendations WHERE guild_id = ? AND member_id = ?",
+                (guild_id, int(member_id)),
+            )
+        return cursor.rowcount > 0
+
+    # --- Votes hebdomadaires ---
+    def record_ballots(self, guild_id, vote_id, ballots):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO votes (vote_id, guild_id) VALUES (?, ?)",
+                (int(vote_id), guild_id),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ballots (vote_id, user_id, event_id)"
+                " VALUES (?, ?, ?)",
+                [
+                    (int(vote_id), int(user_id), event_id)
+                    for user_id, event_id in ballots.items()
+                ],
+            )
+
+    def latest_vote(self, guild_id):
+        row = self._conn.execute(
+            "SELECT vote_id FROM votes WHERE guild_id = ?"
+            " ORDER BY vote_id DESC LIMIT 1",
+            (guild_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        ballots = self._conn.execute(
+            "SELECT user_id, event_id FROM ballots WHERE vote_id = ?",
+            (row["vote_id"],),
+        )
+        return str(row["vote_id"]), {str(b["user_id"]): b["event_id"] for b in ballots}
+
+    def delete_vote(self, guild_id, vote_id):
+        with self._conn:
+            self._conn.execute("DELETE FROM ballots WHERE vote_id = ?", (int(vote_id),))
+            self._conn.execute("DELETE FROM votes WHERE vote_id = ?", (int(vote_id),))
+
+    # --- Scores des groupes ---
+    def group_scores(self, guild_id):
+        rows = self._conn.execute(
+            "SELECT group_name, score FROM group_scores WHERE guild_id = ?",
+            (guild_id,),
+        )
+        return {row["group_name"]: row["score"] for row in rows}
+
+    def top_group_scores(self, guild_id, limit):
+        rows = self._conn.execute(
+            "SELECT group_name, score FROM group_scores WHERE guild_id = ?"
+            " ORDER BY score DESC, group_name LIMIT ?",
+            (guild_id, limit),
+        )
+        return [(row["group_name"], row["score"]) for row in rows]
+
+    def increment_group_score(self, guild_id, group_name, amount=1):
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO group_scores (guild_id, group_name, score)"
+                " VALUES (?, ?, ?)"
+                " ON CONFLICT (guild_id, group_name)"
+                " DO UPDATE SET score = score + excluded.score",
+                (guild_id, group_name, amount),
+            )
+
+    def set_group_score(self, guild_id, group_name, score):
+        """Fixe le score d'un groupe (import idempotent des fichiers JSON)."""
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO group_scores (guild_id, group_name, score)"
+                " VALUES (?, ?, ?)",
+                (guild_id, group_name, score),
+            )
+
+    def reset_group_scores(self, guild_id):
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM group_scores WHERE guild_id = ?", (guild_id,)
+            )
+
+    # --- Registre (messages du bot, etc.) ---
+    def get_entry(self, guild_id, kind, key):
+        row = self._conn.execute(
+            "SELECT value FROM registry WHERE guild_id = ? AND kind = ? AND key = ?",
+            (guild_id, kind, key),
+        ).fetchone()
+        return json.loads(row["value"]) if row else None
+
+    def entries(self, guild_id, kind):
+        rows = self._conn.execute(
+            "SELECT key, value FROM registry WHERE guild_id = ? AND kind = ?",
+            (guild_id, kind),
+        )
+        return {row["key"]: json.loads(row["value"]) for row in rows}
+
+    def set_entry(self, guild_id, kind, key, value):
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO registry (guild_id, kind, key, value)"
+                " VALUES (?, ?, ?, ?)",
+                (guild_id, kind, key, json.dumps(value)),
+            )
+
+    def delete_entry(self, guild_id, kind, key):
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM registry WHERE guild_id = ? AND kind = ? AND key = ?",
+                (guild_id, kind, key),
+            )
+
+
+def vote_guilds(events_data):
+    """Associe chaque vote JSON à son serveur : {vote_id: (guild_id, bulletins)}.
+
+    Les votes JSON ne connaissent pas leur serveur : on le déduit des événements votés.
+    """
+    event_guilds = {
+        event_id: int(server_id)
+        for server_id, events in events_data.items()
+        for event_id in events
+    }
+    votes = {}
+    for vote_id, ballots in load_data(weekly_votes_db).items():
+        guild_id = next(
+            (event_guilds[e] for e in ballots.values() if e in event_guilds), None
+        )
+        votes[vote_id] = (guild_id, ballots)
+    return votes
+
+
+def migrate_json_to_sqlite(db_path):
+    """Importe en une fois les fichiers JSON existants dans la base SQLite."""
+    target = SQLiteStore(db_path)
+    target.load()
+
+    events_data = load_data(events_db)
+    event_count = 0
+    for server_id, events in events_data.items():
+        for event_id, event in events.items():
+            target.add_event(int(server_id), event_id, event)
+            event_count += 1
+
+    for server_id, recommendations in load_data(recommendations_db).items():
+        for member_id, info in recommendations.items():
+            target.add_recommendation(int(server_id), member_id, info)
+
+    for server_id, scores in load_data(group_scores_db).items():
+        for group_name, score in scores.items():
+            target.set_group_score(int(server_id), group_name, score)
+
+    for vote_id, (guild_id, ballots) in vote_guilds(events_data).items():
+        if guild_id is None:
+            print(f"Vote {vote_id} ignoré : serveur introuvable.")
+            continue
+        target.record_ballots(guild_id, vote_id, ballots)
+
+    for server_id, registry in load_data(registry_db).items():
+        for kind, registry_entries in registry.items():
+            for key, value in registry_entries.items():
+                target.set_entry(int(server_id), kind, key, value)
+
+    target.flush()
+    print(f"Migration terminée : {event_count} événement(s) importé(s) dans {db_path}.")
+
+
+def migrate_json_to_shards(data_dir):
+    """Découpe en une fois les fichiers JSON existants en un dossier par serveur."""
+    target = ShardedStore(
+        [recommendations_db, events_db, group_scores_db, weekly_votes_db, registry_db],
+        data_dir,
+        flush_interval=0,
+        flush_threshold=0,
+        idle_timeout=0,
+    )
+    target.load()
+    for file_name in [recommendations_db, events_db, group_scores_db, registry_db]:
+        for server_id, guild_data in load_data(file_name).items():
+            target._guild(file_name, server_id).update(guild_data)
+            target._touch(file_name, server_id)
+    for vote_id, (guild_id, ballots) in vote_guilds(load_data(events_db)).items():
+        if guild_id is None:
+            print(f"Vote {vote_id} ignoré : serveur introuvable.")
+            continue
+        target._votes(guild_id)[vote_id] = ballots
+        target._touch(weekly_votes_db, guild_id)
+    target.flush()
+    print(
+        f"Migration terminée : {len(os.listdir(data_dir))} serveur(s) dans {data_dir}."
+    )
+
+
+def create_store():
+    """Instancie le stockage choisi par STORAGE_BACKEND (json par défaut)."""
+    file_names = [
+        recommendations_db,
+        events_db,
+        group_scores_db,
+        weekly_votes_db,
+        registry_db,
+    ]
+    if SHARD_IDS is not None and STORAGE_BACKEND not in ("sqlite", "sharded"):
+        # Les fichiers json/journal sont réécrits en entier par chaque processus
+        raise ValueError(
+            "SHARD_IDS (plusieurs processus) exige STORAGE_BACKEND=sharded ou sqlite."
+        )
+    if STORAGE_BACKEND == "sqlite":
+        return SQLiteStore(SQLITE_DB_PATH)
+    if STORAGE_BACKEND == "sharded":
+        return ShardedStore(
+            file_names,
+            DATA_DIR,
+            flush_interval=DATA_FLUSH_INTERVAL,
+            flush_threshold=DATA_FLUSH_THRESHOLD,
+            idle_timeout=DATA_IDLE_TIMEOUT,
+        )
+    if STORAGE_BACKEND == "journal":
+        return JournaledStore(
+            file_names,
+            journal_file=DATA_JOURNAL_FILE,
+            max_journal_bytes=DATA_JOURNAL_MAX_BYTES,
+            compact_interval=DATA_COMPACT_INTERVAL,
+        )
+    return JsonStore(
+        file_names,
+        flush_interval=DATA_FLUSH_INTERVAL,
+        flush_threshold=DATA_FLUSH_THRESHOLD,
+    )
+
+
+store = create_store()
+store.load()
 
 
 # --- Journal d'actions (Logging) ---
@@ -61,7 +1289,7 @@ async def log_action(
     guild: discord.Guild, title: str, description: str, color=discord.Color.blue()
 ):
     """Envoie un message de log dans le salon dédié aux admins."""
-    log_channel = discord.utils.get(guild.text_channels, name=LOG_CHANNEL_NAME_ADMIN)
+    log_channel = name_index.text_channel(guild, LOG_CHANNEL_NAME_ADMIN)
     if log_channel:
         embed = discord.Embed(
             title=f"📋 Log : {title}", description=description, color=color
@@ -81,28 +1309,1140 @@ intents.members = True
 intents.message_content = True
 intents.reactions = True
 
-bot = commands.Bot(command_prefix=commands.when_mentioned_or("§"), intents=intents)
+
+def create_bot():
+    """Bot à une seule connexion, ou AutoShardedBot si SHARD_COUNT/SHARD_IDS."""
+    prefix = commands.when_mentioned_or("§")
+    if not SHARD_COUNT and SHARD_IDS is None:
+        return commands.Bot(command_prefix=prefix, intents=intents)
+    shard_count = None if SHARD_COUNT in ("", "auto") else int(SHARD_COUNT)
+    if SHARD_IDS is not None and shard_count is None:
+        raise ValueError("SHARD_IDS exige un SHARD_COUNT numérique.")
+    return commands.AutoShardedBot(
+        command_prefix=prefix,
+        intents=intents,
+        shard_count=shard_count,
+        shard_ids=SHARD_IDS,
+    )
+
+
+def is_primary_process():
+    """Vrai pour le processus chargé des opérations globales (celui du shard 0)."""
+    return SHARD_IDS is None or 0 in SHARD_IDS
+
+
+bot = create_bot()
+
+
+async def setup_hook():
+    """Ferme proprement le bot sur SIGTERM (arrêt du worker).
+
+    bot.run() rend alors la main et le bloc final de __main__ écrit les
+    dernières modifications.
+    """
+    with contextlib.suppress(NotImplementedError):  # Pas de signaux sous Windows
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGTERM, lambda: asyncio.ensure_future(bot.close())
+        )
+
+
+bot.setup_hook = setup_hook
 
 
 # =================================================================================
 # === FONCTIONS UTILITAIRES
 # =================================================================================
-async def update_event_proposals_list(guild: discord.Guild):
-    """Met à jour le message listant les propositions d'événements."""
-    proposals_channel = discord.utils.get(
-        guild.text_channels, name=EVENT_PROPOSALS_CHANNEL_NAME
+class GuildNameIndex:
+    """Index nom -> salons textuels, catégories et rôles de chaque serveur.
+
+    Construit à la disponibilité du serveur puis tenu à jour par les événements
+    de création/modification/suppression, pour éviter de parcourir
+    guild.text_channels ou guild.roles à chaque recherche.
+    """
+
+    def __init__(self):
+        self._guilds = {}  # guild_id -> {(type, nom): {ids}}
+
+    @staticmethod
+    def _kind(obj):
+        if isinstance(obj, discord.Role):
+            return "role"
+        if isinstance(obj, discord.CategoryChannel):
+            return "category"
+        if isinstance(obj, discord.TextChannel):
+            return "text"
+        return None
+
+    def build(self, guild: discord.Guild):
+        index = {}
+        for obj in [*guild.text_channels, *guild.categories, *guild.roles]:
+            index.setdefault((self._kind(obj), obj.name), set()).add(obj.id)
+        self._guilds[guild.id] = index
+        return index
+
+    def forget(self, guild: discord.Guild):
+        self._guilds.pop(guild.id, None)
+
+    def add(self, obj):
+        index = self._guilds.get(obj.guild.id)
+        kind = self._kind(obj)
+        if index is not None and kind:
+            index.setdefault((kind, obj.name), set()).add(obj.id)
+
+    def remove(self, obj):
+        index = self._guilds.get(obj.guild.id)
+        key = (self._kind(obj), obj.name)
+        if index is not None and key in index:
+            index[key].discard(obj.id)
+            if not index[key]:
+                del index[key]
+
+    def _lookup(self, guild, kind, name, resolve, candidates):
+        index = self._guilds.get(guild.id)
+        if index is None:
+            index = self.build(guild)
+        ids = index.get((kind, name))
+        if not ids:
+            return None
+        if len(ids) == 1:
+            found = resolve(next(iter(ids)))
+            if found is not None:
+                return found
+        # Homonymes ou index en retard : même résultat que discord.utils.get
+        return discord.utils.get(candidates(), name=name)
+
+    def text_channel(self, guild: discord.Guild, name: str):
+        return self._lookup(
+            guild, "text", name, guild.get_channel, lambda: guild.text_channels
+        )
+
+    def category(self, guild: discord.Guild, name: str):
+        return self._lookup(
+            guild, "category", name, guild.get_channel, lambda: guild.categories
+        )
+
+    def role(self, guild: discord.Guild, name: str):
+        return self._lookup(guild, "role", name, guild.get_role, lambda: guild.roles)
+
+
+name_index = GuildNameIndex()
+
+
+GROUP_ROLE_PREFIX = "groupe "
+GROUP_CATEGORY_PREFIX = "👥 GROUPE "
+# Préfixes des salons créés par /groupe, avec le type de salon correspondant
+GROUP_CHANNEL_PREFIXES = {
+    "🔒-gestion-": "gestion",
+    "💬-": "chat",
+    "🔊 Vocal - ": "voice",
+}
+
+
+def group_slug(name: str):
+    """Slug d'un groupe tel qu'utilisé dans le nom de ses salons."""
+    return name.lower().replace(" ", "-")
+
+
+class GroupRegistry:
+    """Groupes de chaque serveur : slug -> rôle, slug -> salons, membre -> rôle.
+
+    Tenu à jour par les événements de rôles, de salons et de membres, pour
+    résoudre le groupe d'un membre ou d'un salon sans parcourir les rôles.
+    """
+
+    def __init__(self):
+        self._guilds = {}
+
+    def build(self, guild: discord.Guild):
+        state = {"roles": {}, "channels": {}, "members": {}}
+        self._guilds[guild.id] = state
+        for role in guild.roles:
+            if role.name.startswith(GROUP_ROLE_PREFIX):
+                state["roles"][group_slug(role.name[7:])] = role.id
+                for member in role.members:
+                    state["members"].setdefault(member.id, role.id)
+        for channel in guild.channels:
+            self.add_channel(channel)
+        return state
+
+    def forget(self, guild: discord.Guild):
+        self._guilds.pop(guild.id, None)
+
+    def _state(self, guild):
+        state = self._guilds.get(guild.id)
+        return state if state is not None else self.build(guild)
+
+    @staticmethod
+    def _channel_slot(channel):
+        for prefix, kind in GROUP_CHANNEL_PREFIXES.items():
+            if channel.name.startswith(prefix):
+                return group_slug(channel.name[len(prefix) :]), kind
+        return None, None
+
+    # --- Mises à jour (événements gateway) ---
+    def add_role(self, role: discord.Role):
+        state = self._guilds.get(role.guild.id)
+        if state is not None and role.name.startswith(GROUP_ROLE_PREFIX):
+            state["roles"][group_slug(role.name[7:])] = role.id
+
+    def remove_role(self, role: discord.Role, keep_members=False):
+        state = self._guilds.get(role.guild.id)
+        if state is None:
+            return
+        slug = group_slug(role.name[7:])
+        if state["roles"].get(slug) == role.id:
+            del state["roles"][slug]
+        if not keep_members:
+            state["members"] = {
+                member_id: role_id
+                for member_id, role_id in state["members"].items()
+                if role_id != role.id
+            }
+
+    def rename_role(self, before: discord.Role, after: discord.Role):
+        self.remove_role(before, keep_members=after.name.startswith(GROUP_ROLE_PREFIX))
+        self.add_role(after)
+
+    def add_channel(self, channel):
+        state = self._guilds.get(channel.guild.id)
+        slug, kind = self._channel_slot(channel)
+        if state is not None and slug is not None:
+            state["channels"].setdefault(slug, {})[kind] = channel.id
+
+    def remove_channel(self, channel):
+        state = self._guilds.get(channel.guild.id)
+        slug, kind = self._channel_slot(channel)
+        if state is not None and slug in state["channels"]:
+            if state["channels"][slug].get(kind) == channel.id:
+                del state["channels"][slug][kind]
+
+    def set_member(self, member: discord.Member, role=None):
+        state = self._guilds.get(member.guild.id)
+        if state is None:
+            return
+        if role is None:
+            state["members"].pop(member.id, None)
+        else:
+            state["members"][member.id] = role.id
+
+    def update_member(self, member: discord.Member):
+        """Recalcule le groupe d'un membre d'après ses rôles actuels."""
+        self.set_member(
+            member,
+            discord.utils.find(
+                lambda r: r.name.startswith(GROUP_ROLE_PREFIX), member.roles
+            ),
+        )
+
+    # --- Consultation ---
+    def roles(self, guild: discord.Guild):
+        return [
+            role
+            for role in map(guild.get_role, self._state(guild)["roles"].values())
+            if role is not None
+        ]
+
+    def role(self, guild: discord.Guild, slug: str):
+        role_id = self._state(guild)["roles"].get(slug)
+        return guild.get_role(role_id) if role_id else None
+
+    def group_of(self, member: discord.Member):
+        """Rôle de groupe du membre, ou None."""
+        role_id = self._state(member.guild)["members"].get(member.id)
+        role = member.get_role(role_id) if role_id else None
+        if role is None and role_id:
+            # Registre en retard sur le cache : on recalcule ce membre
+            self.update_member(member)
+            role_id = self._guilds[member.guild.id]["members"].get(member.id)
+            role = member.get_role(role_id) if role_id else None
+        return role
+
+    def group_of_channel(self, channel):
+        """Rôle du groupe auquel appartient ce salon de groupe, ou None."""
+        slug, _ = self._channel_slot(channel)
+        return self.role(channel.guild, slug) if slug is not None else None
+
+    def channel(self, guild: discord.Guild, role: discord.Role, kind: str):
+        """Salon "gestion", "chat" ou "voice" du groupe, ou None."""
+        channels = self._state(guild)["channels"].get(group_slug(role.name[7:]), {})
+        return guild.get_channel(channels[kind]) if kind in channels else None
+
+
+group_registry = GroupRegistry()
+
+
+class VoteTally:
+    """État d'un vote par réaction : message, votants distincts par emoji."""
+
+    def __init__(self, message: discord.Message, voters):
+        self.message = message
+        self.embed = message.embeds[0]
+        self.voters = voters  # emoji -> {user_id}
+        self.decided = False
+
+    def count(self, emoji: str):
+        return len(self.voters.get(emoji, ()))
+
+
+class QuorumTracker:
+    """Votes par réaction en cours (recommandation, exclusion, proposition).
+
+    Un message n'est lu qu'une fois (au premier événement qui le concerne) ;
+    les événements d'ajout et de retrait de réaction tiennent ensuite les
+    ensembles de votants à jour sans nouvel appel à l'API.
+    """
+
+    def __init__(self, emojis=("✅", "❌")):
+        self.emojis = emojis
+        self._tallies = {}  # message_id -> VoteTally
+        self._loading = {}  # message_id -> tâche de lecture en cours
+
+    async def get(self, channel, message_id: int):
+        """Décompte du message, lu au premier appel ; None si ce n'est pas un vote."""
+        tally = self._tallies.get(message_id)
+        if tally is not None:
+            return tally
+        task = self._loading.get(message_id)
+        if task is None:
+            task = asyncio.ensure_future(self._load(channel, message_id))
+            self._loading[message_id] = task
+            task.add_done_callback(lambda _: self._loading.pop(message_id, None))
+        return await task
+
+    async def peek(self, message_id: int):
+        """Décompte déjà connu (ou en cours de lecture), sans appel à l'API."""
+        task = self._loading.get(message_id)
+        if task is not None:
+            return await task
+        return self._tallies.get(message_id)
+
+    async def _load(self, channel, message_id):
+        try:
+            message = await channel.fetch_message(message_id)
+        except discord.NotFound:
+            return None
+        if not (message.author == bot.user and message.embeds):
+            return None
+        voters = {}
+        for reaction in message.reactions:
+            if str(reaction.emoji) in self.emojis:
+                voters[str(reaction.emoji)] = {
+                    user.id async for user in reaction.users() if not user.bot
+                }
+        tally = self._tallies[message_id] = VoteTally(message, voters)
+        return tally
+
+    def forget(self, message_id: int):
+        self._tallies.pop(message_id, None)
+
+
+quorum_tracker = QuorumTracker()
+
+
+class RefreshScheduler:
+    """Rafraîchissements différés et regroupés des messages publics du bot.
+
+    mark() signale qu'une vue d'un serveur est à refaire : elle est rendue
+    `debounce` secondes après la dernière demande, et au plus tard `max_delay`
+    secondes après la première. Une seule tâche par serveur traite ses vues.
+    """
+
+    def __init__(self, debounce, max_delay):
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self._views = {}  # nom -> (rendu, debounce, max_delay)
+        self._dirty = {}  # guild_id -> {(nom, *args): (première, dernière demande)}
+        self._tasks = {}
+        self._wakeups = {}
+
+    def register(self, name, renderer, debounce=None, max_delay=None):
+        self._views[name] = (
+            renderer,
+            self.debounce if debounce is None else debounce,
+            self.max_delay if max_delay is None else max_delay,
+        )
+
+    def mark(self, guild: discord.Guild, name: str, *args):
+        now = time.monotonic()
+        dirty = self._dirty.setdefault(guild.id, {})
+        first, _ = dirty.get((name, *args), (now, now))
+        dirty[(name, *args)] = (first, now)
+        if guild.id in self._tasks:
+            self._wakeups[guild.id].set()
+        else:
+            self._wakeups[guild.id] = asyncio.Event()
+            self._tasks[guild.id] = asyncio.ensure_future(self._run(guild))
+
+    def _due(self, key, requested):
+        _, debounce, max_delay = self._views[key[0]]
+        first, last = requested
+        return min(last + debounce, first + max_delay)
+
+    async def _run(self, guild):
+        dirty = self._dirty[guild.id]
+        wakeup = self._wakeups[guild.id]
+        try:
+            while dirty:
+                now = time.monotonic()
+                due = {key: self._due(key, times) for key, times in dirty.items()}
+                ready = [key for key, at in due.items() if at <= now]
+                if not ready:
+                    wakeup.clear()
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), min(due.values()) - now)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                for key in ready:
+                    del dirty[key]  # Une demande pendant le rendu le reprogramme
+                for name, *args in ready:
+                    try:
+                        await self._views[name][0](guild, *args)
+                    except Exception as e:
+                        print(f"Erreur lors du rafraîchissement '{name}' : {e}")
+        finally:
+            del self._tasks[guild.id]
+            del self._wakeups[guild.id]
+
+
+refresh_scheduler = RefreshScheduler(REFRESH_DEBOUNCE, REFRESH_MAX_DELAY)
+
+
+async def for_each_guild(
+    func,
+    guilds=None,
+    concurrency=GUILD_FANOUT_CONCURRENCY,
+    timeout=GUILD_TASK_TIMEOUT,
+):
+    """Exécute `await func(guild)` sur chaque serveur, en parallèle.
+
+    Par défaut, les serveurs de ce processus (ses shards) encore disponibles.
+    Au plus `concurrency` serveurs à la fois, `timeout` secondes chacun ; une
+    erreur ou un dépassement n'interrompt pas les autres serveurs. Renvoie le
+    nombre de serveurs en échec.
+    """
+    if guilds is None:
+        guilds = [guild for guild in bot.guilds if not guild.unavailable]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(guild):
+        async with semaphore:
+            try:
+                await asyncio.wait_for(func(guild), timeout)
+                return True
+            except asyncio.TimeoutError:
+                print(f"{func.__name__} : délai dépassé sur {guild.name}.")
+            except Exception as e:
+                print(f"{func.__name__} : erreur sur {guild.name} : {e}")
+            return False
+
+    results = await asyncio.gather(*(run(guild) for guild in guilds))
+    return results.count(False)
+
+
+async def with_retry(call, retries=API_RETRIES):
+    """Appelle `await call()` en réessayant sur 429 et erreurs 5xx de l'API."""
+    for attempt in range(retries + 1):
+        try:
+            return await call()
+        except discord.HTTPException as e:
+            if attempt == retries or not (e.status == 429 or e.status >= 500):
+                raise
+            retry_after = float(e.response.headers.get("Retry-After", 0) or 0)
+            await asyncio.sleep(max(retry_after, 2**attempt))
+
+
+class RolePlan:
+    """Rôles à ajouter et à retirer par membre, appliqués en une requête par membre.
+
+    Pour un même membre et un même rôle, la dernière opération demandée gagne.
+    """
+
+    def __init__(self):
+        self._changes = {}  # member_id -> (membre, rôles à ajouter, à retirer)
+
+    def _entry(self, member):
+        return self._changes.setdefault(member.id, (member, set(), set()))
+
+    def add(self, member: discord.Member, role: discord.Role):
+        _, to_add, to_remove = self._entry(member)
+        to_add.add(role)
+        to_remove.discard(role)
+
+    def remove(self, member: discord.Member, role: discord.Role):
+        _, to_add, to_remove = self._entry(member)
+        to_remove.add(role)
+        to_add.discard(role)
+
+    async def apply(
+        self,
+        guild: discord.Guild,
+        reason: str,
+        log_title=None,
+        concurrency=ROLE_EDIT_CONCURRENCY,
+    ):
+        """Applique le plan ; renvoie {"edited", "unchanged", "failed": [membres]}."""
+        semaphore = asyncio.Semaphore(concurrency)
+        summary = {"edited": 0, "unchanged": 0, "failed": []}
+
+        async def edit(member, to_add, to_remove):
+            current = set(member.roles)
+            target = (current - to_remove) | to_add
+            if target == current:
+                summary["unchanged"] += 1
+                return
+            roles = [role for role in target if not role.is_default()]
+            async with semaphore:
+                try:
+                    await with_retry(lambda: member.edit(roles=roles, reason=reason))
+                    summary["edited"] += 1
+                except discord.HTTPException as e:
+                    print(f"Erreur de rôles pour {member.display_name} : {e}")
+                    summary["failed"].append(member)
+
+        await asyncio.gather(*(edit(*change) for change in self._changes.values()))
+        if log_title and (summary["edited"] or summary["failed"]):
+            color = (
+                discord.Color.orange() if summary["failed"] else discord.Color.green()
+            )
+            await log_action(
+                guild,
+                log_title,
+                f"{summary['edited']} membre(s) modifié(s), "
+                f"{summary['unchanged']} inchangé(s), "
+                f"{len(summary['failed'])} échec(s).",
+                color=color,
+            )
+        return summary
+
+
+# Suppressions de groupes en cours : NOM DU GROUPE -> {name, role_id, category_id,
+# channel_ids}. Chaque étape terminée est retirée de l'entrée, effacée à la fin.
+TEARDOWNS = "teardowns"
+_teardowns_running = set()  # (guild_id, clé)
+
+
+def plan_group_teardown(guild, name, role=None, category=None, channels=None):
+    """Enregistre la suppression d'un groupe ; renvoie sa clé."""
+    key = name.upper()
+    if channels is None:
+        channels = category.channels if category else []
+    store.set_entry(
+        guild.id,
+        TEARDOWNS,
+        key,
+        {
+            "name": name,
+            "role_id": role.id if role else None,
+            "category_id": category.id if category else None,
+            "channel_ids": [channel.id for channel in channels],
+        },
     )
-    if not proposals_channel:
-        return
+    return key
+
+
+async def _delete_for_teardown(target, reason):
+    """Supprime `target` ; True si c'est fait ou s'il n'existe déjà plus."""
+    if target is None:
+        return True
+    try:
+        await with_retry(lambda: target.delete(reason=reason))
+        return True
+    except discord.NotFound:
+        return True
+    except discord.HTTPException as e:
+        print(f"Erreur lors de la suppression de {target.name} : {e}")
+        return False
+
+
+async def run_group_teardown(guild, key, concurrency=TEARDOWN_CONCURRENCY):
+    """Supprime les salons (en parallèle), la catégorie puis le rôle d'un groupe.
+
+    La progression est enregistrée après chaque étape : une suppression
+    interrompue est reprise par `sweep_group_teardowns`. Renvoie True une fois
+    le groupe entièrement supprimé.
+    """
+    running_key = (guild.id, key)
+    if running_key in _teardowns_running:
+        return False
+    _teardowns_running.add(running_key)
+    try:
+        entry = store.get_entry(guild.id, TEARDOWNS, key)
+        if entry is None:
+            return True
+        entry = dict(entry)
+        category = guild.get_channel(entry["category_id"] or 0)
+        channel_ids = list(entry["channel_ids"])
+        if category is not None:  # Salons ajoutés depuis la planification
+            channel_ids += [c.id for c in category.channels if c.id not in channel_ids]
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def delete_channel(channel_id):
+            async with semaphore:
+                return await _delete_for_teardown(
+                    guild.get_channel(channel_id), "Groupe vide"
+                )
 
-    events_data = load_data(events_db).get(str(guild.id), {})
-    active_events = {
-        k: v for k, v in events_data.items() if v.get("status") == "active"
+        results = await asyncio.gather(*map(delete_channel, channel_ids))
+        entry["channel_ids"] = [
+            channel_id for channel_id, done in zip(channel_ids, results) if not done
+        ]
+        store.set_entry(guild.id, TEARDOWNS, key, entry)
+        if entry["channel_ids"]:
+            return False
+
+        for step in ("category_id", "role_id"):
+            if entry[step] is None:
+                continue
+            get = guild.get_channel if step == "category_id" else guild.get_role
+            if not await _delete_for_teardown(get(entry[step]), "Groupe vide"):
+                return False
+            entry[step] = None
+            store.set_entry(guild.id, TEARDOWNS, key, entry)
+
+        store.delete_entry(guild.id, TEARDOWNS, key)
+        return True
+    finally:
+        _teardowns_running.discard(running_key)
+
+
+def _category_roles(category):
+    """Rôles ayant des permissions sur une catégorie ou ses salons (hors @everyone)."""
+    roles = set()
+    for target in (category, *category.channels):
+        roles.update(
+            role
+            for role in target.overwrites
+            if isinstance(role, discord.Role)
+            and not role.is_default()
+            and not role.managed
+        )
+    return roles
+
+
+# Catégories trouvées orphelines au dernier passage : guild_id -> {category_id}
+_orphan_candidates = {}
+
+
+async def sweep_group_teardowns(guild: discord.Guild):
+    """Reprend les suppressions interrompues et collecte les catégories orphelines.
+
+    Une catégorie de groupe est orpheline si aucun rôle de ses permissions
+    (celles de la catégorie et de ses salons) n'a de membres, passé un délai de
+    TEARDOWN_GRACE secondes après sa création ; renommer le rôle d'un groupe ne
+    rend donc pas sa catégorie orpheline. Elle n'est collectée qu'après deux
+    passages consécutifs, et jamais tant que les membres du serveur ne sont pas
+    tous en cache (après une reconnexion, `role.members` peut être vide).
+    """
+    await store.warm(guild.id)
+    previous = _orphan_candidates.pop(guild.id, set())
+    candidates = set()
+    deadline = discord.utils.utcnow() - timedelta(seconds=TEARDOWN_GRACE)
+    for category in guild.categories if guild.chunked else ():
+        if (
+            not category.name.startswith(GROUP_CATEGORY_PREFIX)
+            or category.created_at > deadline
+        ):
+            continue
+        name = category.name[len(GROUP_CATEGORY_PREFIX) :]
+        roles = _category_roles(category)
+        if any(role.members for role in roles) or store.get_entry(
+            guild.id, TEARDOWNS, name
+        ):
+            continue
+        candidates.add(category.id)
+        if category.id not in previous:
+            continue  # Confirmée au prochain passage
+        group_roles = [r for r in roles if r.name.startswith(GROUP_ROLE_PREFIX)]
+        # Le rôle n'est supprimé avec la catégorie que s'il est sans ambiguïté
+        role = group_roles[0] if len(group_roles) == 1 else None
+        plan_group_teardown(guild, name, role, category)
+        await log_action(
+            guild,
+            "Nettoyage de Groupe",
+            f"La catégorie **{category.name}** n'a plus de groupe actif et va être "
+            "supprimée.",
+            color=discord.Color.orange(),
+        )
+    if candidates:
+        _orphan_candidates[guild.id] = candidates
+
+    for key, entry in store.entries(guild.id, TEARDOWNS).items():
+        if await run_group_teardown(guild, key):
+            await log_action(
+                guild,
+                "Groupe Supprimé",
+                f"Le groupe **{entry['name']}** a été supprimé avec succès.",
+                color=discord.Color.red(),
+            )
+
+
+def _raise_first_error(outcomes):
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            raise outcome
+
+
+async def provision_group(guild, creator, nom, couleur):
+    """Crée le rôle, la catégorie et les salons d'un groupe, avec son créateur.
+
+    Les étapes indépendantes sont lancées en parallèle ; en cas d'échec, les
+    objets déjà créés sont supprimés. Renvoie {"ok", "role", "category",
+    "channels", "timings", "error"}, avec la durée (s) de chaque étape.
+    """
+    result = {
+        "ok": False,
+        "role": None,
+        "category": None,
+        "channels": [],
+        "timings": {},
+        "error": None,
     }
 
-    sorted_events = sorted(
-        active_events.items(), key=lambda item: item[1]["average_rating"], reverse=True
+    async def step(name, awaitable):
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            result["timings"][name] = round(time.perf_counter() - start, 3)
+
+    try:
+        role = result["role"] = await step(
+            "role",
+            guild.create_role(
+                name=f"{GROUP_ROLE_PREFIX}{nom}",
+                colour=couleur,
+                reason=f"Création du groupe par {creator}",
+            ),
+        )
+        outcomes = await asyncio.gather(
+            step("member", with_retry(lambda: creator.add_roles(role))),
+            step(
+                "category",
+                guild.create_category(f"{GROUP_CATEGORY_PREFIX}{nom.upper()}"),
+            ),
+            return_exceptions=True,
+        )
+        if not isinstance(outcomes[1], BaseException):
+            result["category"] = outcomes[1]
+        _raise_first_error(outcomes)
+        group_registry.add_role(role)
+        group_registry.set_member(creator, role)
+
+        category = result["category"]
+        overwrites = {
+            guild.default_role: discord.PermissionOverwrite(read_messages=False),
+            role: discord.PermissionOverwrite(
+                read_messages=True, send_messages=True, connect=True, speak=True
+            ),
+            guild.me: discord.PermissionOverwrite(
+                read_messages=True, send_messages=True
+            ),
+        }
+        slug = group_slug(nom)
+        outcomes = await asyncio.gather(
+            step(
+                "chat",
+                category.create_text_channel(f"💬-{slug}", overwrites=overwrites),
+            ),
+            step(
+                "gestion",
+                category.create_text_channel(
+                    f"🔒-gestion-{slug}", overwrites=overwrites
+                ),
+            ),
+            step(
+                "voice",
+                category.create_voice_channel(
+                    f"🔊 Vocal - {nom}", overwrites=overwrites
+                ),
+            ),
+            return_exceptions=True,
+        )
+        result["channels"] = [
+            channel for channel in outcomes if not isinstance(channel, BaseException)
+        ]
+        _raise_first_error(outcomes)
+        result["ok"] = True
+    except discord.HTTPException as e:
+        result["error"] = str(e)
+        await step("rollback", _rollback_group(guild, nom, result))
+    return result
+
+
+async def _rollback_group(guild, nom, result):
+    """Supprime les objets d'une création de groupe échouée.
+
+    Ce qui ne peut pas être supprimé est confié à `sweep_group_teardowns`.
+    """
+    reason = "Échec de la création du groupe"
+    done = all(
+        await asyncio.gather(
+            *(_delete_for_teardown(channel, reason) for channel in result["channels"])
+        )
     )
+    for target in (result["category"], result["role"]):
+        done = done and await _delete_for_teardown(target, reason)
+    if result["role"] is not None:
+        group_registry.remove_role(result["role"])
+    if not done:
+        plan_group_teardown(
+            guild, nom, result["role"], result["category"], result["channels"]
+        )
+
+
+def load_timezone(name: str):
+    """Fuseau horaire `name`, ou celui de la machine s'il est inconnu."""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        print(f"Fuseau horaire '{name}' introuvable : utilisation de l'heure locale.")
+        return datetime.now().astimezone().tzinfo
+
+
+def parse_cron_field(field: str, low: int, high: int):
+    """Valeurs d'un champ cron (`*`, `5`, `1-5`, `*/15`, listes) ; None pour `*`."""
+    if field == "*":
+        return None
+    values = set()
+    for part in field.split(","):
+        if part.startswith("*/"):
+            values.update(range(low, high + 1, int(part[2:])))
+        elif "-" in part:
+            start, end = map(int, part.split("-"))
+            if start > end:
+                raise ValueError(f"Intervalle cron inversé : {part!r}")
+            values.update(range(start, end + 1))
+        else:
+            values.add(int(part))
+    if not all(low <= value <= high for value in values):
+        raise ValueError(f"Champ cron hors limites : {field!r}")
+    return values
+
+
+class CronJob:
+    """Tâche planifiée au format cron, exécutée pour chaque serveur."""
+
+    def __init__(self, name, spec, func, label):
+        fields = spec.split()
+        if len(fields) != 5:
+            raise ValueError(f"Planification invalide pour {name} : {spec!r}")
+        bounds = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+        parsed = [
+            parse_cron_field(field, low, high)
+            for field, (low, high) in zip(fields, bounds)
+        ]
+        if any(values == set() for values in parsed):
+            raise ValueError(f"Planification invalide pour {name} : {spec!r}")
+        minutes, hours, self.days, self.months, weekdays = parsed
+        self.weekdays = None if weekdays is None else {day % 7 for day in weekdays}
+        self.times = [
+            (hour, minute)
+            for hour in sorted(hours or range(24))
+            for minute in sorted(minutes or range(60))
+        ]
+        self.name = name
+        self.func = func
+        self.label = label
+        self.next_fire(datetime.now())  # Lève ValueError si jamais déclenchée
+
+    def _runs_on(self, day):
+        if self.months is not None and day.month not in self.months:
+            return False
+        weekday = (day.weekday() + 1) % 7  # 0 = dimanche, comme cron
+        if self.days is None:
+            return self.weekdays is None or weekday in self.weekdays
+        if self.weekdays is None:
+            return day.day in self.days
+        # Comme cron : si les deux champs sont restreints, l'un ou l'autre suffit
+        return day.day in self.days or weekday in self.weekdays
+
+    def _fires_on(self, day, tz):
+        if not self._runs_on(day):
+            return []
+        return [
+            datetime(day.year, day.month, day.day, hour, minute, tzinfo=tz)
+            for hour, minute in self.times
+        ]
+
+    def fires_between(self, start: datetime, end: datetime):
+        """Déclenchements dans [start, end[."""
+        day = start.date()
+        while day <= end.date():
+            for fire in self._fires_on(day, start.tzinfo):
+                if start <= fire < end:
+                    yield fire
+            day += timedelta(days=1)
+
+    def next_fire(self, after: datetime):
+        """Premier déclenchement strictement après `after`."""
+        day = after.date()
+        for _ in range(5 * 366):  # Assez pour un 29 février
+            for fire in self._fires_on(day, after.tzinfo):
+                if fire > after:
+                    return fire
+            day += timedelta(days=1)
+        raise ValueError(f"Aucun déclenchement prévu pour {self.name}")
+
+    def previous_fire(self, before: datetime):
+        """Dernier déclenchement au plus tard à `before`, ou None."""
+        day = before.date()
+        for _ in range(5 * 366):
+            for fire in reversed(self._fires_on(day, before.tzinfo)):
+                if fire <= before:
+                    return fire
+            day -= timedelta(days=1)
+        return None
+
+
+# Dernière échéance traitée par tâche planifiée : nom -> date ISO
+CRON_STATE = "cron"
+
+
+class CronScheduler:
+    """Exécute les tâches planifiées à heure fixe, dans le fuseau `tz`.
+
+    Chaque tâche dort jusqu'à sa prochaine échéance. Chaque serveur garde dans
+    le stockage la dernière échéance traitée : après un redémarrage, une
+    échéance déjà jouée ne l'est pas une seconde fois, et une échéance manquée
+    depuis moins de `catchup_window` secondes est rattrapée.
+    """
+
+    def __init__(self, tz, catchup_window):
+        self.tz = tz
+        self.catchup_window = catchup_window
+        self.jobs = []
+        self._tasks = []
+
+    def add(self, name, spec, func, label):
+        self.jobs.append(CronJob(name, spec, func, label))
+
+    def now(self):
+        return datetime.now(self.tz)
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.ensure_future(self._run(job)) for job in self.jobs]
+
+    def upcoming(self, limit=None):
+        """Prochaines échéances triées : [(date, tâche), ...]."""
+        now = self.now()
+        fires = sorted(
+            ((job.next_fire(now), job) for job in self.jobs), key=lambda item: item[0]
+        )
+        return fires[:limit]
+
+    async def _run(self, job):
+        missed = job.previous_fire(self.now())
+        if missed and time.time() - missed.timestamp() <= self.catchup_window:
+            await self._fire(job, missed, catchup=True)
+        while True:
+            fire = job.next_fire(self.now())
+            # timestamp() tient compte des changements d'heure
+            delay = fire.timestamp() - time.time()
+            while delay > 0:
+                await asyncio.sleep(min(delay, 3600))
+                delay = fire.timestamp() - time.time()
+            await self._fire(job, fire)
+
+    async def _fire(self, job, fire, catchup=False):
+        async def run(guild):
+            await store.warm(guild.id)
+            last_run = store.get_entry(guild.id, CRON_STATE, job.name)
+            if last_run is not None and datetime.fromisoformat(last_run) >= fire:
+                return
+            # Marquée avant l'exécution : une échéance n'est jamais jouée deux fois
+            store.set_entry(guild.id, CRON_STATE, job.name, fire.isoformat())
+            if catchup and last_run is None:
+                return  # Première mise en service : rien à rattraper
+            await job.func(guild)
+
+        run.__name__ = job.name
+        await for_each_guild(run)
+
+
+cron = CronScheduler(load_timezone(BOT_TIMEZONE), CRON_CATCHUP_WINDOW)
+
+
+# Registre des votes par réaction ouverts : message_id -> {channel_id, kind}
+OPEN_VOTES = "open_votes"
+
+
+def track_vote(message: discord.Message, kind: str):
+    """Enregistre un message de vote : seules ses réactions seront traitées."""
+    store.set_entry(
+        message.guild.id,
+        OPEN_VOTES,
+        str(message.id),
+        {"channel_id": message.channel.id, "kind": kind},
+    )
+
+
+def vote_kind(message: discord.Message):
+    """Type de vote d'un message posté par le bot, d'après son embed ; sinon None."""
+    if message.author.id != bot.user.id or not message.embeds:
+        return None
+    title = message.embeds[0].title or ""
+    if title == "Nouvelle recommandation de membre":
+        return "recommendation"
+    if title == "Vote d'exclusion":
+        return "exclusion"
+    if title.startswith("Nouvelle proposition : "):
+        return "proposal"
+    return None
+
+
+# Messages absents du registre déjà examinés : message_id -> tâche (un seul fetch)
+_vote_backfills = {}
+
+
+async def backfill_vote(channel, message_id: int):
+    """Enregistre un vote ouvert avant le registre OPEN_VOTES ; True si c'en est un."""
+    task = _vote_backfills.get(message_id)
+    if task is None:
+        if len(_vote_backfills) >= 10000:
+            _vote_backfills.clear()
+        task = _vote_backfills[message_id] = asyncio.ensure_future(
+            _backfill_vote(channel, message_id)
+        )
+    return await asyncio.shield(task)
+
+
+async def _backfill_vote(channel, message_id):
+    try:
+        message = await channel.fetch_message(message_id)
+    except discord.HTTPException:
+        return False
+    kind = vote_kind(message)
+    if kind is None:
+        return False
+    track_vote(message, kind)
+    return True
+
+
+# Registre des messages uniques du bot : purpose -> {channel_id, message_id}
+MESSAGE_POINTERS = "messages"
+
+
+# Champs d'embed ignorés par l'empreinte : ils changent à chaque rendu
+VOLATILE_EMBED_KEYS = ("timestamp", "footer")
+# (type de message, "skipped" ou "sent") -> nombre de mises à jour
+embed_update_stats = Counter()
+
+
+def embed_fingerprint(embed: discord.Embed):
+    content = {
+        key: value
+        for key, value in embed.to_dict().items()
+        if key not in VOLATILE_EMBED_KEYS
+    }
+    return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+
+
+def register_message(
+    guild: discord.Guild, purpose: str, message: discord.Message, fingerprint=None
+):
+    store.set_entry(
+        guild.id,
+        MESSAGE_POINTERS,
+        purpose,
+        {
+            "channel_id": message.channel.id,
+            "message_id": message.id,
+            "fingerprint": fingerprint,
+        },
+    )
+
+
+def is_unchanged(guild: discord.Guild, purpose: str, channel, fingerprint: str):
+    """Vrai si le dernier message publié pour `purpose` a déjà ce contenu."""
+    pointer = store.get_entry(guild.id, MESSAGE_POINTERS, purpose)
+    unchanged = (
+        pointer is not None
+        and pointer["channel_id"] == channel.id
+        and pointer.get("fingerprint") == fingerprint
+    )
+    embed_update_stats[purpose.split(":")[0], "skipped" if unchanged else "sent"] += 1
+    return unchanged
+
+
+def registered_message(guild: discord.Guild, purpose: str, channel):
+    """Message enregistré pour `purpose` dans ce salon (sans appel API), ou None."""
+    pointer = store.get_entry(guild.id, MESSAGE_POINTERS, purpose)
+    if pointer and pointer["channel_id"] == channel.id:
+        return channel.get_partial_message(pointer["message_id"])
+    return None
+
+
+async def edit_bot_message(
+    guild: discord.Guild, purpose: str, channel, embed, is_previous, history_limit
+):
+    """Édite le message du bot enregistré pour `purpose`, ou le crée.
+
+    Sans pointeur valide (premier passage, message supprimé), on retombe sur
+    l'ancienne recherche dans l'historique du salon.
+    """
+    fingerprint = embed_fingerprint(embed)
+    if is_unchanged(guild, purpose, channel, fingerprint):
+        return
+    message = registered_message(guild, purpose, channel)
+    if message is not None:
+        try:
+            await message.edit(embed=embed)
+            register_message(guild, purpose, message, fingerprint)
+            return
+        except discord.NotFound:
+            store.delete_entry(guild.id, MESSAGE_POINTERS, purpose)
+
+    async for message in channel.history(limit=history_limit):
+        if message.author == bot.user and is_previous(message):
+            try:
+                await message.edit(embed=embed)
+            except discord.NotFound:
+                continue
+            register_message(guild, purpose, message, fingerprint)
+            return
+
+    register_message(guild, purpose, await channel.send(embed=embed), fingerprint)
+
+
+async def replace_bot_message(
+    guild: discord.Guild, purpose: str, channel, embed, is_previous, history_limit
+):
+    """Supprime le message du bot enregistré pour `purpose` et en envoie un nouveau."""
+    fingerprint = embed_fingerprint(embed)
+    if is_unchanged(guild, purpose, channel, fingerprint):
+        return
+    message = registered_message(guild, purpose, channel)
+    if message is not None:
+        try:
+            await message.delete()
+        except discord.NotFound:
+            pass
+    else:
+        async for message in channel.history(limit=history_limit):
+            if message.author == bot.user and is_previous(message):
+                try:
+                    await message.delete()
+                except discord.NotFound:
+                    pass
+
+    register_message(guild, purpose, await channel.send(embed=embed), fingerprint)
+
+
+def is_titled(title: str):
+    """Filtre les messages dont le premier embed porte ce titre."""
+    return lambda message: bool(message.embeds) and message.embeds[0].title == title
+
+
+async def refresh_proposals(guild: discord.Guild):
+    """Met à jour le message listant les propositions d'événements."""
+    proposals_channel = name_index.text_channel(guild, EVENT_PROPOSALS_CHANNEL_NAME)
+    if not proposals_channel:
+        return
+
+    await store.warm(guild.id)
+    sorted_events = store.active_events(guild.id)
 
     embed = discord.Embed(
         title="💡 Propositions d'Événements Actuelles",
@@ -118,57 +2458,63 @@ async def update_event_proposals_list(guild: discord.Guild):
             event_list_str += (
                 f"**{event['title']}** (par *{event['proposer_group'][7:]}*)\n"
                 f"> Note moyenne : **{event['average_rating']:.2f}/5** "
-                f"sur {len(event['ratings'])} vote(s)\n"
+                f"sur {event['rating_count']} vote(s)\n"
                 f"> ID : `{event_id}`\n\n"
             )
         embed.description += "\n\n" + event_list_str
 
-    async for message in proposals_channel.history(limit=50):
-        if (
-            message.author == bot.user
-            and message.embeds
-            and message.embeds[0].title == embed.title
-        ):
-            try:
-                await message.edit(embed=embed)
-                return
-            except discord.NotFound:
-                continue
+    await edit_bot_message(
+        guild, "proposals", proposals_channel, embed, is_titled(embed.title), 50
+    )
 
-    await proposals_channel.send(embed=embed)
 
+@functools.lru_cache(maxsize=24)
+def month_layout(year: int, month: int):
+    """Grille du mois et jours des activités planifiées (à ne pas modifier)."""
+    cal = calendar.Calendar()
+    month_days = cal.monthdayscalendar(year, month)
 
-async def generate_calendar_embed(guild: discord.Guild, year: int, month: int):
-    """Génère un embed de calendrier amélioré pour un mois donné."""
-    events_data = load_data(events_db).get(str(guild.id), {})
+    start = datetime(year, month, 1, tzinfo=cron.tz)
+    end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=cron.tz)
+    fire_days = {
+        job.name: [fire.day for fire in job.fires_between(start, end)]
+        for job in cron.jobs
+    }
+    vote_days = {
+        day: "Début du vote hebdomadaire" for day in fire_days.get("weekly_vote", [])
+    }
+    announcement_days = {
+        day: "Annonce de l'événement de la semaine"
+        for day in fire_days.get("announce_winner", [])
+    }
+    monthly_days = fire_days.get("monthly_event")
+    monthly_event_day = monthly_days[0] if monthly_days else None
 
-    validated_events = {}
-    vote_days = {}
-    announcement_days = {}
-    monthly_event_day = None
-
-    for event_id, event in events_data.items():
-        if event.get("date") and event.get("status") == "validated":
-            event_date = datetime.fromisoformat(event["date"])
-            if event_date.year == year and event_date.month == month:
-                if event_date.day not in validated_events:
-                    validated_events[event_date.day] = []
-                validated_events[event_date.day].append(event["title"])
+    return month_days, vote_days, announcement_days, monthly_event_day
 
-    cal = calendar.Calendar()
-    month_days = cal.monthdayscalendar(year, month)
 
-    for week in month_days:
-        for day_index, day in enumerate(week):
-            if day == 0:
-                continue
-            if day_index == 2:
-                vote_days[day] = "Début du vote hebdomadaire"
-            if day_index == 4:
-                announcement_days[day] = "Annonce de l'événement de la semaine"
+# (guild_id, année, mois) -> (version des événements, embed rendu en dict)
+calendar_render_cache = {}
 
-    if 1 in [day for week in month_days for day in week]:
-        monthly_event_day = 1
+
+async def generate_calendar_embed(guild: discord.Guild, year: int, month: int):
+    """Génère un embed de calendrier amélioré pour un mois donné."""
+    version = store.events_version(guild.id)
+    cached = calendar_render_cache.get((guild.id, year, month))
+    if cached and cached[0] == version:
+        return discord.Embed.from_dict(cached[1])
+
+    await store.warm(guild.id)
+    validated_events = {}
+    for event_id, event in store.events_in_month(guild.id, year, month):
+        event_date = datetime.fromisoformat(event["date"])
+        if event_date.day not in validated_events:
+            validated_events[event_date.day] = []
+        validated_events[event_date.day].append(event["title"])
+
+    month_days, vote_days, announcement_days, monthly_event_day = month_layout(
+        year, month
+    )
 
     month_names_fr = [
         "Janvier",
@@ -226,7 +2572,7 @@ async def generate_calendar_embed(guild: discord.Guild, year: int, month: int):
 
     recurring_events_str = ""
     if monthly_event_day:
-        recurring_events_str += f"**01/{month:02d}** : 🏆 Annonce du Groupe du Mois et lancement de leur événement spécial.\n"
+        recurring_events_str += f"**{monthly_event_day:02d}/{month:02d}** : 🏆 Annonce du Groupe du Mois et lancement de leur événement spécial.\n"
     for day in sorted(vote_days.keys()):
         recurring_events_str += f"**{day:02d}/{month:02d}** : 🗳️ {vote_days[day]}\n"
     for day in sorted(announcement_days.keys()):
@@ -240,14 +2586,44 @@ async def generate_calendar_embed(guild: discord.Guild, year: int, month: int):
     )
 
     embed.set_footer(text="🎉: Événement de groupe | 🗳️: Vote | 🏆: Événement mensuel")
+    calendar_render_cache[guild.id, year, month] = (version, embed.to_dict())
     return embed
 
 
+def is_calendar_message(message: discord.Message):
+    return bool(message.embeds) and message.embeds[0].title.startswith("📅 Calendrier")
+
+
 # =================================================================================
 # === COMMANDES SLASH (/)
 # =================================================================================
 
 
+async def report_database_busy(interaction: discord.Interaction, error):
+    """Prévient l'utilisateur quand SQLite est verrouillé par un autre processus."""
+    print(f"Base de données occupée : {error}")
+    if interaction.response.is_done():
+        send = interaction.followup.send
+    else:
+        send = interaction.response.send_message
+    with contextlib.suppress(discord.HTTPException):
+        await send(
+            "❌ La base de données est momentanément occupée, réessayez dans "
+            "quelques instants.",
+            ephemeral=True,
+        )
+
+
+@bot.tree.error
+async def on_app_command_error(
+    interaction: discord.Interaction, error: app_commands.AppCommandError
+):
+    if isinstance(getattr(error, "original", None), sqlite3.OperationalError):
+        await report_database_busy(interaction, error.original)
+        return
+    await app_commands.CommandTree.on_error(bot.tree, interaction, error)
+
+
 @bot.tree.command(
     name="aide", description="Affiche la liste des commandes disponibles."
 )
@@ -295,9 +2671,7 @@ async def aide(interaction: discord.Interaction):
 async def groupe(interaction: discord.Interaction, nom: str, couleur: str):
     await interaction.response.defer(ephemeral=True)
 
-    if discord.utils.find(
-        lambda r: r.name.startswith("groupe "), interaction.user.roles
-    ):
+    if group_registry.group_of(interaction.user):
         await interaction.followup.send(
             "❌ Vous faites déjà partie d'un groupe. Quittez-le avec `/quitter` pour en créer un nouveau.",
             ephemeral=True,
@@ -316,33 +2690,31 @@ async def groupe(interaction: discord.Interaction, nom: str, couleur: str):
     guild = interaction.guild
     role_name = f"groupe {nom}"
 
-    if discord.utils.get(guild.roles, name=role_name):
+    if name_index.role(guild, role_name):
         await interaction.followup.send(
             f"❌ Un groupe nommé '{nom}' existe déjà.", ephemeral=True
         )
         return
 
-    nouveau_role = await guild.create_role(
-        name=role_name,
-        colour=couleur_obj,
-        reason=f"Création du groupe par {interaction.user}",
-    )
-    await interaction.user.add_roles(nouveau_role)
-
-    categorie = await guild.create_category(f"👥 GROUPE {nom.upper()}")
-    overwrites = {
-        guild.default_role: discord.PermissionOverwrite(read_messages=False),
-        nouveau_role: discord.PermissionOverwrite(
-            read_messages=True, send_messages=True, connect=True, speak=True
-        ),
-        guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True),
-    }
-
-    nom_slug = nom.lower().replace(" ", "-")
-    await categorie.create_text_channel(f"💬-{nom_slug}", overwrites=overwrites)
-    await categorie.create_text_channel(f"🔒-gestion-{nom_slug}", overwrites=overwrites)
-    await categorie.create_voice_channel(f"🔊 Vocal - {nom}", overwrites=overwrites)
-
+    resultat = await provision_group(guild, interaction.user, nom, couleur_obj)
+    durees = ", ".join(
+        f"{step} {delay:.2f}s" for step, delay in resultat["timings"].items()
+    )
+    print(f"Création du groupe {nom} : {durees}")
+    if not resultat["ok"]:
+        await interaction.followup.send(
+            "❌ La création du groupe a échoué. Réessayez dans quelques instants.",
+            ephemeral=True,
+        )
+        await log_action(
+            guild,
+            "Échec de Création de Groupe",
+            f"La création du groupe **{nom}** par {interaction.user.mention} a été "
+            f"annulée : {resultat['error']}",
+            color=discord.Color.orange(),
+        )
+        return
+
     await interaction.followup.send(
         f"✅ Le groupe '{nom}' a été créé avec succès et vous en êtes le premier membre !",
         ephemeral=True,
@@ -363,7 +2735,7 @@ async def groupes(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
     guild = interaction.guild
 
-    all_group_roles = [role for role in guild.roles if role.name.startswith("groupe ")]
+    all_group_roles = group_registry.roles(guild)
 
     embed = discord.Embed(
         title="👥 Liste des Groupes",
@@ -405,7 +2777,7 @@ async def rejoindre(interaction: discord.Interaction, nom_groupe: str):
     await interaction.response.defer(ephemeral=True)
     member = interaction.user
     guild = interaction.guild
-    role_demande = discord.utils.get(guild.roles, name=f"groupe {nom_groupe}")
+    role_demande = name_index.role(guild, f"groupe {nom_groupe}")
 
     if not role_demande:
         await interaction.followup.send(
@@ -420,13 +2792,22 @@ async def rejoindre(interaction: discord.Interaction, nom_groupe: str):
         )
         return
 
-    ancien_role = discord.utils.find(
-        lambda r: r.name.startswith("groupe "), member.roles
-    )
+    ancien_role = group_registry.group_of(member)
+    plan = RolePlan()
     if ancien_role:
-        await member.remove_roles(ancien_role, reason="Changement de groupe")
-
-    await member.add_roles(role_demande, reason=f"A rejoint le groupe {nom_groupe}")
+        plan.remove(member, ancien_role)
+    plan.add(member, role_demande)
+    summary = await plan.apply(guild, reason=f"A rejoint le groupe {nom_groupe}")
+    if summary["failed"]:
+        await interaction.followup.send(
+            "❌ Impossible de changer tes rôles pour le moment, réessaie plus tard.",
+            ephemeral=True,
+        )
+        return
+    group_registry.set_member(member, role_demande)
+    refresh_scheduler.mark(guild, "profile", role_demande.id)
+    if ancien_role:
+        refresh_scheduler.mark(guild, "profile", ancien_role.id)
     await interaction.followup.send(
         f"✅ Tu as bien rejoint le groupe **{nom_groupe}** !", ephemeral=True
     )
@@ -437,9 +2818,7 @@ async def quitter(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
     member = interaction.user
     guild = interaction.guild
-    role_groupe = discord.utils.find(
-        lambda r: r.name.startswith("groupe "), member.roles
-    )
+    role_groupe = group_registry.group_of(member)
 
     if not role_groupe:
         await interaction.followup.send(
@@ -449,6 +2828,8 @@ async def quitter(interaction: discord.Interaction):
 
     nom_groupe_original = role_groupe.name[7:]
     await member.remove_roles(role_groupe, reason="A quitté le groupe")
+    group_registry.set_member(member)
+    refresh_scheduler.mark(guild, "profile", role_groupe.id)
     await interaction.followup.send(
         f"✅ Tu as quitté le groupe **{nom_groupe_original}**.", ephemeral=True
     )
@@ -462,33 +2843,26 @@ async def quitter(interaction: discord.Interaction):
             color=discord.Color.orange(),
         )
 
-        categorie = discord.utils.get(
-            guild.categories, name=f"👥 GROUPE {nom_groupe_original.upper()}"
+        categorie = name_index.category(
+            guild, f"{GROUP_CATEGORY_PREFIX}{nom_groupe_original.upper()}"
         )
-        if categorie:
-            for channel in categorie.channels:
-                try:
-                    await channel.delete(reason="Groupe vide")
-                except discord.HTTPException as e:
-                    print(f"Erreur lors de la suppression du salon {channel.name}: {e}")
-            try:
-                await categorie.delete(reason="Groupe vide")
-            except discord.HTTPException as e:
-                print(
-                    f"Erreur lors de la suppression de la catégorie {categorie.name}: {e}"
-                )
-
-        try:
-            await role_groupe_updated.delete(reason="Groupe vide")
+        key = plan_group_teardown(
+            guild, nom_groupe_original, role_groupe_updated, categorie
+        )
+        if await run_group_teardown(guild, key):
             await log_action(
                 guild,
                 "Groupe Supprimé",
                 f"Le groupe **{nom_groupe_original}** a été supprimé avec succès.",
                 color=discord.Color.red(),
             )
-        except discord.HTTPException as e:
-            print(
-                f"Erreur lors de la suppression du rôle {role_groupe_updated.name}: {e}"
+        else:
+            await log_action(
+                guild,
+                "Suppression Incomplète",
+                f"Le groupe **{nom_groupe_original}** n'a pas pu être entièrement "
+                "supprimé ; la suppression sera reprise automatiquement.",
+                color=discord.Color.orange(),
             )
 
 
@@ -501,25 +2875,25 @@ async def quitter(interaction: discord.Interaction):
 async def recommander(interaction: discord.Interaction, membre: discord.Member):
     await interaction.response.defer(ephemeral=True)
 
-    data = load_data(recommendations_db)
-    server_id = str(interaction.guild.id)
-    if server_id not in data:
-        data[server_id] = {}
-
-    if str(membre.id) in data[server_id]:
+    async with store.transaction(interaction.guild.id) as data:
+        already_pending = data.get_recommendation(interaction.guild.id, membre.id)
+        if not already_pending:
+            data.add_recommendation(
+                interaction.guild.id,
+                membre.id,
+                {
+                    "recommender_id": interaction.user.id,
+                    "timestamp": datetime.utcnow().isoformat(),
+                },
+            )
+    if already_pending:
         await interaction.followup.send(
             "Ce membre est déjà en cours de validation.", ephemeral=True
         )
         return
 
-    data[server_id][str(membre.id)] = {
-        "recommender_id": interaction.user.id,
-        "timestamp": datetime.utcnow().isoformat(),
-    }
-    save_data(data, recommendations_db)
-
-    assemblee_channel = discord.utils.get(
-        interaction.guild.text_channels, name=ANNONCES_CHANNEL_NAME
+    assemblee_channel = name_index.text_channel(
+        interaction.guild, ANNONCES_CHANNEL_NAME
     )
     if not assemblee_channel:
         await interaction.followup.send(
@@ -535,6 +2909,7 @@ async def recommander(interaction: discord.Interaction, membre: discord.Member):
         )
         embed.set_footer(text=f"ID du membre: {membre.id}")
         msg = await assemblee_channel.send(embed=embed)
+        track_vote(msg, "recommendation")
         await msg.add_reaction("✅")
 
     except discord.Forbidden:
@@ -587,8 +2962,8 @@ async def exclure(
         )
         return
 
-    assemblee_channel = discord.utils.get(
-        interaction.guild.text_channels, name=ANNONCES_CHANNEL_NAME
+    assemblee_channel = name_index.text_channel(
+        interaction.guild, ANNONCES_CHANNEL_NAME
     )
     if not assemblee_channel:
         await interaction.followup.send(
@@ -606,6 +2981,7 @@ async def exclure(
         embed.set_footer(text=f"ID du membre à exclure: {membre.id}")
 
         msg = await assemblee_channel.send(embed=embed)
+        track_vote(msg, "exclusion")
         await msg.add_reaction("✅")
 
     except discord.Forbidden:
@@ -642,10 +3018,16 @@ class GroupProfileModal(Modal, title="Mise à jour du profil de groupe"):
         max_length=1024,
     )
 
+    async def on_error(self, interaction: discord.Interaction, error: Exception):
+        if isinstance(error, sqlite3.OperationalError):
+            await report_database_busy(interaction, error)
+        else:
+            await super().on_error(interaction, error)
+
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
-        profile_channel = discord.utils.get(
-            interaction.guild.text_channels, name=PROFILES_CHANNEL_NAME
+        profile_channel = name_index.text_channel(
+            interaction.guild, PROFILES_CHANNEL_NAME
         )
         if not profile_channel:
             await interaction.followup.send(
@@ -654,9 +3036,7 @@ class GroupProfileModal(Modal, title="Mise à jour du profil de groupe"):
             )
             return
 
-        author_group_role = discord.utils.find(
-            lambda r: r.name.startswith("groupe "), interaction.user.roles
-        )
+        author_group_role = group_registry.group_of(interaction.user)
         if not author_group_role:
             await interaction.followup.send(
                 "❌ Vous devez faire partie d'un groupe pour utiliser cette commande.",
@@ -664,17 +3044,6 @@ class GroupProfileModal(Modal, title="Mise à jour du profil de groupe"):
             )
             return
 
-        existing_message = None
-        async for message in profile_channel.history(limit=100):
-            if (
-                message.author == bot.user
-                and message.embeds
-                and message.embeds[0].footer.text
-                == f"ID du groupe : {author_group_role.id}"
-            ):
-                existing_message = message
-                break
-
         embed = discord.Embed(
             title=f"Profil du groupe : {author_group_role.name[7:]}",
             description=self.description.value,
@@ -688,10 +3057,15 @@ class GroupProfileModal(Modal, title="Mise à jour du profil de groupe"):
         )
         embed.set_footer(text=f"ID du groupe : {author_group_role.id}")
 
-        if existing_message:
-            await existing_message.edit(embed=embed)
-        else:
-            await profile_channel.send(embed=embed)
+        await edit_bot_message(
+            interaction.guild,
+            f"profile:{author_group_role.id}",
+            profile_channel,
+            embed,
+            lambda message: bool(message.embeds)
+            and message.embeds[0].footer.text == embed.footer.text,
+            100,
+        )
 
         await interaction.followup.send(
             "✅ Profil de groupe mis à jour !", ephemeral=True
@@ -732,11 +3106,15 @@ class ProposeEventModal(Modal, title="Proposer un nouvel événement"):
         max_length=10,
     )
 
+    async def on_error(self, interaction: discord.Interaction, error: Exception):
+        if isinstance(error, sqlite3.OperationalError):
+            await report_database_busy(interaction, error)
+        else:
+            await super().on_error(interaction, error)
+
     async def on_submit(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
-        group_role = discord.utils.find(
-            lambda r: r.name.startswith("groupe "), interaction.user.roles
-        )
+        group_role = group_registry.group_of(interaction.user)
         if not group_role:
             await interaction.followup.send(
                 "❌ Vous devez faire partie d'un groupe.", ephemeral=True
@@ -752,9 +3130,8 @@ class ProposeEventModal(Modal, title="Proposer un nouvel événement"):
             )
             return
 
-        gestion_slug = group_role.name[7:].lower().replace(" ", "-")
-        gestion_channel = discord.utils.get(
-            interaction.guild.text_channels, name=f"🔒-gestion-{gestion_slug}"
+        gestion_channel = group_registry.channel(
+            interaction.guild, group_role, "gestion"
         )
         if not gestion_channel:
             await interaction.followup.send(
@@ -778,6 +3155,7 @@ class ProposeEventModal(Modal, title="Proposer un nouvel événement"):
             )
 
         msg = await gestion_channel.send(embed=embed)
+        track_vote(msg, "proposal")
         await msg.add_reaction("✅")
         await msg.add_reaction("❌")
 
@@ -817,22 +3195,17 @@ async def noter(
     interaction: discord.Interaction, id_evenement: str, note: app_commands.Choice[int]
 ):
     await interaction.response.defer(ephemeral=True)
-    events_data = load_data(events_db)
-    server_id = str(interaction.guild.id)
-
-    if server_id not in events_data or id_evenement not in events_data[server_id]:
+    async with store.transaction(interaction.guild.id) as data:
+        event = data.rate_event(
+            interaction.guild.id, id_evenement, interaction.user.id, note.value
+        )
+    if event is None:
         await interaction.followup.send(
             "❌ Cet ID d'événement n'existe pas ou n'est plus valide.", ephemeral=True
         )
         return
 
-    event = events_data[server_id][id_evenement]
-    event["ratings"][str(interaction.user.id)] = note.value
-    total_ratings = sum(event["ratings"].values())
-    event["average_rating"] = round(total_ratings / len(event["ratings"]), 2)
-    save_data(events_data, events_db)
-
-    await update_event_proposals_list(interaction.guild)
+    refresh_scheduler.mark(interaction.guild, "proposals")
     await interaction.followup.send(
         f'✅ Votre note de **{note.value}/5** a bien été prise en compte pour l\'événement "{event["title"]}".',
         ephemeral=True,
@@ -846,11 +3219,9 @@ async def noter(
 @app_commands.checks.has_permissions(manage_messages=True)
 async def classement(interaction: discord.Interaction):
     await interaction.response.defer(ephemeral=True)
-    channel = discord.utils.get(
-        interaction.guild.text_channels, name=LEADERBOARD_CHANNEL_NAME
-    )
+    channel = name_index.text_channel(interaction.guild, LEADERBOARD_CHANNEL_NAME)
     if channel:
-        await update_leaderboard_task()
+        await refresh_leaderboard(interaction.guild)
         await interaction.followup.send("✅ Classements mis à jour.", ephemeral=True)
     else:
         await interaction.followup.send(
@@ -871,7 +3242,7 @@ async def calendrier(
 ):
     await interaction.response.defer(ephemeral=True)
 
-    now = datetime.now()
+    now = cron.now()
     target_month = mois if mois else now.month
     target_year = annee if annee else now.year
 
@@ -881,9 +3252,7 @@ async def calendrier(
         )
         return
 
-    calendar_channel = discord.utils.get(
-        interaction.guild.text_channels, name=CALENDAR_CHANNEL_NAME
-    )
+    calendar_channel = name_index.text_channel(interaction.guild, CALENDAR_CHANNEL_NAME)
     if not calendar_channel:
         await interaction.followup.send(
             f"❌ Le salon `{CALENDAR_CHANNEL_NAME}` est introuvable. Veuillez le créer.",
@@ -893,17 +3262,16 @@ async def calendrier(
 
     embed = await generate_calendar_embed(interaction.guild, target_year, target_month)
 
-    async for message in calendar_channel.history(limit=5):
-        if (
-            message.author == bot.user
-            and message.embeds
-            and message.embeds[0].title.startswith("📅 Calendrier")
-        ):
-            await message.delete()
-
-    await calendar_channel.send(embed=embed)
+    await edit_bot_message(
+        interaction.guild, "calendar", calendar_channel, embed, is_calendar_message, 5
+    )
+    upcoming = "\n".join(
+        f"• {job.label} : {fire.strftime('%d/%m à %H:%M')}"
+        for fire, job in cron.upcoming()
+    )
     await interaction.followup.send(
-        f"✅ Le calendrier a été mis à jour dans {calendar_channel.mention}.",
+        f"✅ Le calendrier a été mis à jour dans {calendar_channel.mention}.\n\n"
+        f"⏰ **Prochaines échéances**\n{upcoming}",
         ephemeral=True,
     )
 
@@ -913,6 +3281,59 @@ async def calendrier(
 # =================================================================================
 
 
+class BallotBuffer:
+    """Regroupe les bulletins du vote hebdomadaire avant de les écrire.
+
+    Un bulletin est gardé en mémoire et le vote est confirmé tout de suite ;
+    les bulletins sont ensuite écrits par lots (BALLOT_BATCH_SIZE bulletins
+    ou BALLOT_FLUSH_DELAY secondes), un seul appel au stockage par vote.
+    """
+
+    def __init__(self, batch_size, flush_delay):
+        self.batch_size = batch_size
+        self.flush_delay = flush_delay
+        self._pending = {}  # (guild_id, vote_id) -> {user_id: event_id}
+        self._count = 0
+        self._timer = None
+
+    def add(self, guild_id, vote_id, user_id, event_id):
+        self._pending.setdefault((guild_id, vote_id), {})[str(user_id)] = event_id
+        self._count += 1
+        if self._count >= self.batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                self.flush_delay, self.flush
+            )
+
+    def flush(self):
+        """Écrit tout de suite les bulletins en attente (avant un dépouillement).
+
+        Les bulletins d'un vote dont l'écriture échoue sont remis en attente
+        (sans écraser un bulletin plus récent) et retentés au prochain flush.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending, self._count = self._pending, {}, 0
+        for key, ballots in pending.items():
+            try:
+                store.record_ballots(*key, ballots)
+            except Exception as e:
+                print(f"Erreur d'écriture des bulletins du vote {key[1]} : {e}")
+                newer = self._pending.get(key, {})
+                self._pending[key] = {**ballots, **newer}
+                self._count += len(ballots)
+        if self._pending and self._timer is None:
+            with contextlib.suppress(RuntimeError):  # Pas de boucle : arrêt du bot
+                self._timer = asyncio.get_running_loop().call_later(
+                    self.flush_delay, self.flush
+                )
+
+
+ballot_buffer = BallotBuffer(BALLOT_BATCH_SIZE, BALLOT_FLUSH_DELAY)
+
+
 class WeeklyVoteView(View):
     def __init__(self, options, vote_id):
         super().__init__(timeout=172800)  # 48h
@@ -929,215 +3350,199 @@ class WeeklyVoteView(View):
         return select
 
     async def select_callback(self, interaction: discord.Interaction):
-        votes_data = load_data(weekly_votes_db)
-        if self.vote_id not in votes_data:
-            votes_data[self.vote_id] = {}
-
-        votes_data[self.vote_id][str(interaction.user.id)] = self.children[0].values[0]
-        save_data(votes_data, weekly_votes_db)
+        ballot_buffer.add(
+            interaction.guild.id,
+            self.vote_id,
+            interaction.user.id,
+            self.children[0].values[0],
+        )
 
         await interaction.response.send_message(
             "✅ Votre vote a bien été pris en compte !", ephemeral=True
         )
 
 
-@tasks.loop(hours=24)
-async def weekly_vote_announcement():
-    now = datetime.now()
-    if now.weekday() == 2 and now.hour == 18:  # Mercredi 18h
-        for guild in bot.guilds:
-            assemblee_channel = discord.utils.get(
-                guild.text_channels, name=ANNONCES_CHANNEL_NAME
-            )
-            if not assemblee_channel:
-                continue
+async def open_weekly_vote(guild: discord.Guild):
+    assemblee_channel = name_index.text_channel(guild, ANNONCES_CHANNEL_NAME)
+    if not assemblee_channel:
+        return
 
-            events_data = load_data(events_db).get(str(guild.id), {})
-            eligible_events = {
-                k: v for k, v in events_data.items() if v.get("status") == "active"
-            }
-            if not eligible_events:
-                await assemblee_channel.send(
-                    "Il n'y a aucun nouvel événement à voter pour cette semaine."
-                )
-                return
+    sorted_events = store.active_events(guild.id, limit=25)
+    if not sorted_events:
+        await assemblee_channel.send(
+            "Il n'y a aucun nouvel événement à voter pour cette semaine."
+        )
+        return
 
-            sorted_events = sorted(
-                eligible_events.items(),
-                key=lambda item: item[1]["average_rating"],
-                reverse=True,
-            )
-            options = [
-                discord.SelectOption(
-                    label=f"{event.get('category', '[Autre]')} {event['title']}"[:100],
-                    description=f"Note: {event['average_rating']:.2f}/5",
-                    value=event_id,
-                )
-                for event_id, event in sorted_events[:25]
-            ]
+    options = [
+        discord.SelectOption(
+            label=f"{event.get('category', '[Autre]')} {event['title']}"[:100],
+            description=f"Note: {event['average_rating']:.2f}/5",
+            value=event_id,
+        )
+        for event_id, event in sorted_events
+    ]
 
-            if not options:
-                await assemblee_channel.send(
-                    "Aucun événement éligible pour le vote cette semaine."
-                )
-                return
+    if not options:
+        await assemblee_channel.send(
+            "Aucun événement éligible pour le vote cette semaine."
+        )
+        return
 
-            temp_msg = await assemblee_channel.send("Préparation du vote...")
-            vote_id = str(temp_msg.id)
+    temp_msg = await assemblee_channel.send("Préparation du vote...")
+    vote_id = str(temp_msg.id)
 
-            view = WeeklyVoteView(options, vote_id)
-            await temp_msg.edit(
-                content="🗳️ **Vote de la semaine !**\nChoisissez l'événement de la semaine prochaine parmi les propositions :",
-                view=view,
-            )
-            await (
-                update_calendar_task()
-            )  # Met à jour le calendrier pour montrer le début du vote
-
-
-@tasks.loop(hours=24)
-async def announce_winner():
-    now = datetime.now()
-    if now.weekday() == 4 and now.hour == 20:  # Vendredi 20h
-        for guild in bot.guilds:
-            assemblee_channel = discord.utils.get(
-                guild.text_channels, name=ANNONCES_CHANNEL_NAME
-            )
-            if not assemblee_channel:
-                continue
+    view = WeeklyVoteView(options, vote_id)
+    await temp_msg.edit(
+        content="🗳️ **Vote de la semaine !**\nChoisissez l'événement de la semaine prochaine parmi les propositions :",
+        view=view,
+    )
+    # Met à jour le calendrier pour montrer le début du vote
+    refresh_scheduler.mark(guild, "calendar")
 
-            votes_data = load_data(weekly_votes_db)
-            if not votes_data:
-                return
 
-            latest_vote_id = sorted(votes_data.keys())[-1]
-            latest_votes = votes_data[latest_vote_id]
+async def announce_guild_winner(guild: discord.Guild):
+    ballot_buffer.flush()  # Les derniers bulletins doivent être comptés
+    assemblee_channel = name_index.text_channel(guild, ANNONCES_CHANNEL_NAME)
+    if not assemblee_channel:
+        return
 
-            if not latest_votes:
-                await assemblee_channel.send("Personne n'a voté cette semaine !")
-                return
+    async with store.transaction(guild.id) as data:
+        latest_vote = data.latest_vote(guild.id)
+        if not latest_vote:
+            return
 
+        latest_vote_id, latest_votes = latest_vote
+        if latest_votes:
             vote_counts = Counter(latest_votes.values())
             winner_id, _ = vote_counts.most_common(1)[0]
+            winner_info = data.get_event(guild.id, winner_id)
+            if winner_info:
+                # Le vote est clos dans la même transaction : il ne peut
+                # pas être dépouillé deux fois.
+                data.set_event_status(guild.id, winner_id, "validated")
+                data.increment_group_score(guild.id, winner_info["proposer_group"])
+                data.delete_vote(guild.id, latest_vote_id)
+
+    if not latest_votes:
+        await assemblee_channel.send("Personne n'a voté cette semaine !")
+        return
 
-            events_data = load_data(events_db)
-            server_id = str(guild.id)
-            winner_info = events_data.get(server_id, {}).get(winner_id)
-
-            if not winner_info:
-                print(
-                    f"Erreur: L'ID de l'événement gagnant {winner_id} est introuvable."
-                )
-                continue
-
-            events_data[server_id][winner_id]["status"] = "validated"
-            save_data(events_data, events_db)
+    if not winner_info:
+        print(f"Erreur: L'ID de l'événement gagnant {winner_id} est introuvable.")
+        return
 
-            winner_category = winner_info.get("category", "[Autre]")
-            announcement_text = f"🎉 L'événement de la semaine est : **{winner_category} {winner_info['title']}** ! Proposé par le groupe *{winner_info['proposer_group'][7:]}*."
-            announcement_message = await assemblee_channel.send(announcement_text)
+    winner_category = winner_info.get("category", "[Autre]")
+    announcement_text = f"🎉 L'événement de la semaine est : **{winner_category} {winner_info['title']}** ! Proposé par le groupe *{winner_info['proposer_group'][7:]}*."
+    announcement_message = await assemblee_channel.send(announcement_text)
 
-            try:
-                thread_name = f"Feedback sur - {winner_info['title']}"[:100]
-                await announcement_message.create_thread(
-                    name=thread_name, auto_archive_duration=4320
-                )
-            except Exception as e:
-                print(f"Erreur lors de la création du fil de discussion : {e}")
-
-            group_scores = load_data(group_scores_db)
-            if server_id not in group_scores:
-                group_scores[server_id] = {}
-            group_name = winner_info["proposer_group"]
-            group_scores[server_id][group_name] = (
-                group_scores[server_id].get(group_name, 0) + 1
-            )
-            save_data(group_scores, group_scores_db)
+    try:
+        thread_name = f"Feedback sur - {winner_info['title']}"[:100]
+        await announcement_message.create_thread(
+            name=thread_name, auto_archive_duration=4320
+        )
+    except Exception as e:
+        print(f"Erreur lors de la création du fil de discussion : {e}")
 
-            await update_event_proposals_list(guild)
-            await update_calendar_task()
+    refresh_scheduler.mark(guild, "proposals")
+    refresh_scheduler.mark(guild, "calendar")
 
-            del votes_data[latest_vote_id]
-            save_data(votes_data, weekly_votes_db)
 
+async def crown_group_of_the_month(guild: discord.Guild):
+    async with store.transaction(guild.id) as data:
+        group_scores = data.group_scores(guild.id)
+        if group_scores:
+            data.reset_group_scores(guild.id)
+    if not group_scores:
+        return
 
-@tasks.loop(hours=24)
-async def monthly_intercommunity_event():
-    now = datetime.now()
-    if now.day == 1 and now.hour == 12:
-        for guild in bot.guilds:
-            group_scores = load_data(group_scores_db).get(str(guild.id), {})
-            if not group_scores:
-                continue
+    winner_role = name_index.role(guild, MONTHLY_WINNER_ROLE_NAME)
 
-            winner_role = discord.utils.get(guild.roles, name=MONTHLY_WINNER_ROLE_NAME)
-            if winner_role:
-                for member in winner_role.members:
-                    await member.remove_roles(winner_role, reason="Fin du mois")
+    winning_group_name = max(group_scores, key=group_scores.get)
+    score = group_scores[winning_group_name]
+    winning_group_role = name_index.role(guild, winning_group_name)
 
-            winning_group_name = max(group_scores, key=group_scores.get)
-            score = group_scores[winning_group_name]
-            winning_group_role = discord.utils.get(guild.roles, name=winning_group_name)
+    assemblee_channel = name_index.text_channel(guild, ANNONCES_CHANNEL_NAME)
+    if assemblee_channel:
+        embed = discord.Embed(
+            title="🏆 Événement Inter-Communautaire du Mois ! 🏆",
+            description=f"Ce mois-ci, le groupe **{winning_group_name[7:]}** est à l'honneur avec un score de **{score}** événements validés !\n\nIls organiseront la soirée spéciale et reçoivent le rôle honorifique.",
+            color=discord.Color.gold(),
+        )
+        await assemblee_channel.send(embed=embed)
+
+    if winner_role:
+        # Anciens et nouveaux gagnants en une seule requête par membre
+        plan = RolePlan()
+        for member in winner_role.members:
+            plan.remove(member, winner_role)
+        if winning_group_role:
+            for member in winning_group_role.members:
+                plan.add(member, winner_role)
+        await plan.apply(
+            guild, reason="Groupe du mois", log_title="Rotation du Groupe du Mois"
+        )
 
-            assemblee_channel = discord.utils.get(
-                guild.text_channels, name=ANNONCES_CHANNEL_NAME
-            )
-            if assemblee_channel:
-                embed = discord.Embed(
-                    title="🏆 Événement Inter-Communautaire du Mois ! 🏆",
-                    description=f"Ce mois-ci, le groupe **{winning_group_name[7:]}** est à l'honneur avec un score de **{score}** événements validés !\n\nIls organiseront la soirée spéciale et reçoivent le rôle honorifique.",
-                    color=discord.Color.gold(),
-                )
-                await assemblee_channel.send(embed=embed)
+    refresh_scheduler.mark(guild, "leaderboard")
+    refresh_scheduler.mark(guild, "calendar")
 
-            if winning_group_role and winner_role:
-                for member in winning_group_role.members:
-                    await member.add_roles(winner_role, reason="Gagnant du mois")
 
-            group_scores[str(guild.id)] = {}
-            save_data(group_scores, group_scores_db)
-            await update_leaderboard_task()
-            await update_calendar_task()
+async def refresh_leaderboard(guild: discord.Guild):
+    """Met à jour le message des classements d'un serveur."""
+    channel = name_index.text_channel(guild, LEADERBOARD_CHANNEL_NAME)
+    if channel:
+        embed = await generate_leaderboard_embed(guild)
+        await replace_bot_message(
+            guild, "leaderboard", channel, embed, lambda message: True, 10
+        )
 
 
 async def update_leaderboard_task():
+    """Met à jour les classements de tous les serveurs."""
     await bot.wait_until_ready()
-    for guild in bot.guilds:
-        channel = discord.utils.get(guild.text_channels, name=LEADERBOARD_CHANNEL_NAME)
-        if channel:
-            async for message in channel.history(limit=10):
-                if message.author == bot.user:
-                    await message.delete()
-            embed = await generate_leaderboard_embed(guild)
-            await channel.send(embed=embed)
+    await for_each_guild(refresh_leaderboard)
 
 
 @tasks.loop(hours=6)
 async def update_leaderboard_loop():
-    await update_leaderboard_task()
+    if update_leaderboard_loop.current_loop:  # Premier tour fait par warm_guild
+        await update_leaderboard_task()
+
+
+async def refresh_calendar(guild: discord.Guild):
+    """Met à jour le calendrier du mois en cours d'un serveur."""
+    calendar_channel = name_index.text_channel(guild, CALENDAR_CHANNEL_NAME)
+    if calendar_channel:
+        now = cron.now()
+        embed = await generate_calendar_embed(guild, now.year, now.month)
+        await edit_bot_message(
+            guild, "calendar", calendar_channel, embed, is_calendar_message, 5
+        )
 
 
 async def update_calendar_task():
+    """Met à jour le calendrier de tous les serveurs."""
     await bot.wait_until_ready()
-    now = datetime.now()
-    for guild in bot.guilds:
-        calendar_channel = discord.utils.get(
-            guild.text_channels, name=CALENDAR_CHANNEL_NAME
-        )
-        if calendar_channel:
-            embed = await generate_calendar_embed(guild, now.year, now.month)
-            async for message in calendar_channel.history(limit=5):
-                if message.author == bot.user:
-                    try:
-                        await message.delete()
-                    except discord.NotFound:
-                        pass  # Ignore if message is already deleted
-            await calendar_channel.send(embed=embed)
+    await for_each_guild(refresh_calendar)
 
 
 @tasks.loop(hours=1)
 async def update_calendar_loop():
-    await update_calendar_task()
+    if update_calendar_loop.current_loop:  # Premier tour fait par warm_guild
+        await update_calendar_task()
+
+
+async def refresh_guild(guild: discord.Guild):
+    """Met à jour tous les messages publics d'un seul serveur."""
+    await refresh_proposals(guild)
+    await refresh_calendar(guild)
+    await refresh_leaderboard(guild)
+
+
+@tasks.loop(minutes=10)
+async def group_teardown_loop():
+    await bot.wait_until_ready()
+    await for_each_guild(sweep_group_teardowns)
 
 
 async def generate_leaderboard_embed(guild: discord.Guild):
@@ -1145,12 +3550,12 @@ async def generate_leaderboard_embed(guild: discord.Guild):
         title="🏆 Classements de la Communauté �", color=discord.Color.gold()
     )
 
-    group_scores = load_data(group_scores_db).get(str(guild.id), {})
-    sorted_groups = sorted(group_scores.items(), key=lambda item: item[1], reverse=True)
+    await store.warm(guild.id)
+    top_groups = store.top_group_scores(guild.id, 5)
     group_text = "\n".join(
         [
             f"**{i + 1}.** {name[7:]} ({score} pts)"
-            for i, (name, score) in enumerate(sorted_groups[:5])
+            for i, (name, score) in enumerate(top_groups)
         ]
     )
     embed.add_field(
@@ -1159,13 +3564,7 @@ async def generate_leaderboard_embed(guild: discord.Guild):
         inline=False,
     )
 
-    events_data = load_data(events_db).get(str(guild.id), {})
-    all_raters = [
-        user_id
-        for event in events_data.values()
-        for user_id in event.get("ratings", {}).keys()
-    ]
-    top_raters = Counter(all_raters).most_common(5)
+    top_raters = store.rater_counts(guild.id, 5)
     raters_text = "\n".join(
         [
             f"**{i + 1}.** <@{user_id}> ({count} notes)"
@@ -1184,37 +3583,196 @@ async def generate_leaderboard_embed(guild: discord.Guild):
     return embed
 
 
+async def refresh_group_profile(guild: discord.Guild, role_id: int):
+    """Met à jour la liste des membres d'un profil de groupe déjà publié."""
+    role = guild.get_role(role_id)
+    profile_channel = name_index.text_channel(guild, PROFILES_CHANNEL_NAME)
+    if not (role and profile_channel):
+        return
+    purpose = f"profile:{role_id}"
+    message = registered_message(guild, purpose, profile_channel)
+    if message is None:
+        return
+    try:
+        message = await message.fetch()
+    except discord.NotFound:
+        return
+    if not message.embeds:
+        return
+
+    embed = message.embeds[0]
+    members_list = "\n".join([f"• {member.display_name}" for member in role.members])
+    embed.set_field_at(
+        0, name="Membres", value=members_list or "Aucun membre", inline=False
+    )
+    fingerprint = embed_fingerprint(embed)
+    if not is_unchanged(guild, purpose, profile_channel, fingerprint):
+        await message.edit(embed=embed)
+        register_message(guild, purpose, message, fingerprint)
+
+
+refresh_scheduler.register("proposals", refresh_proposals)
+refresh_scheduler.register("calendar", refresh_calendar)
+refresh_scheduler.register("leaderboard", refresh_leaderboard)
+refresh_scheduler.register("profile", refresh_group_profile)
+
+cron.add("weekly_vote", WEEKLY_VOTE_CRON, open_weekly_vote, "🗳️ Vote hebdomadaire")
+cron.add("announce_winner", WINNER_CRON, announce_guild_winner, "📢 Résultat du vote")
+cron.add(
+    "monthly_event", MONTHLY_EVENT_CRON, crown_group_of_the_month, "🏆 Groupe du Mois"
+)
+
+
 # =================================================================================
 # === ÉVÉNEMENTS DU BOT
 # =================================================================================
-@bot.event
-async def on_ready():
-    print(f"Bot connecté en tant que {bot.user}")
-    try:
-        synced = await bot.tree.sync()
-        print(f"Synchronisé {len(synced)} commande(s)")
-    except Exception as e:
-        print(f"Erreur de synchronisation : {e}")
+def command_tree_hash():
+    """Empreinte des définitions des commandes slash."""
+    payload = {
+        "application_id": bot.application_id,
+        "commands": [command.to_dict() for command in bot.tree.get_commands()],
+    }
+    text = json.dumps(payload, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+async def sync_commands():
+    """Synchronise les commandes slash, seulement si leurs définitions ont changé."""
+    if not is_primary_process():
+        print("Commandes synchronisées par le processus du shard 0.")
+        return
+    digest = command_tree_hash()
+    if (await load_data_async(COMMANDS_STATE_FILE)).get("hash") == digest:
+        print("Commandes inchangées : synchronisation ignorée.")
+        return
+    synced = await bot.tree.sync()
+    print(f"Synchronisé {len(synced)} commande(s)")
+    await save_data_async({"hash": digest}, COMMANDS_STATE_FILE)
+
+
+async def warm_guild(guild: discord.Guild):
+    """Charge les données d'un serveur et met à jour ses messages publics."""
+    await store.warm(guild.id)
+    await refresh_guild(guild)
 
+
+async def warm_guilds():
+    store.start()
+    failures = await for_each_guild(warm_guild)
+    print(f"{len(bot.guilds)} serveur(s) préparé(s), {failures} en échec.")
+
+
+async def start_tasks():
     print("Démarrage des tâches en arrière-plan...")
-    weekly_vote_announcement.start()
-    announce_winner.start()
-    monthly_intercommunity_event.start()
+    cron.start()
     update_leaderboard_loop.start()
     update_calendar_loop.start()
+    group_teardown_loop.start()
+
+
+async def startup():
+    """Démarrage en trois phases chronométrées : commandes, serveurs, tâches."""
+    timings = {}
+    for name, phase in (
+        ("commandes", sync_commands),
+        ("serveurs", warm_guilds),
+        ("tâches", start_tasks),
+    ):
+        start = time.perf_counter()
+        try:
+            await phase()
+        except Exception as e:
+            print(f"Erreur au démarrage ({name}) : {e}")
+        timings[name] = time.perf_counter() - start
+    durees = ", ".join(f"{name} {delay:.2f}s" for name, delay in timings.items())
+    print(f"Démarrage terminé : {durees}")
+
+
+_startup_done = False
+
+
+@bot.event
+async def on_ready():
+    global _startup_done
+    print(f"Bot connecté en tant que {bot.user}")
+    if bot.shard_count:
+        print(f"Shards {bot.shard_ids} sur {bot.shard_count}")
+    if _startup_done:
+        return  # Reconnexion : les tâches tournent déjà
+    _startup_done = True
+    await startup()
+
+
+@bot.event
+async def on_guild_available(guild: discord.Guild):
+    name_index.build(guild)
+    group_registry.build(guild)
+
+
+@bot.event
+async def on_guild_join(guild: discord.Guild):
+    name_index.build(guild)
+    group_registry.build(guild)
+
+
+@bot.event
+async def on_guild_remove(guild: discord.Guild):
+    name_index.forget(guild)
+    group_registry.forget(guild)
+
+
+@bot.event
+async def on_guild_channel_create(channel):
+    name_index.add(channel)
+    group_registry.add_channel(channel)
+
+
+@bot.event
+async def on_guild_channel_delete(channel):
+    name_index.remove(channel)
+    group_registry.remove_channel(channel)
+
+
+@bot.event
+async def on_guild_channel_update(before, after):
+    if before.name != after.name:
+        name_index.remove(before)
+        name_index.add(after)
+        group_registry.remove_channel(before)
+        group_registry.add_channel(after)
+
+
+@bot.event
+async def on_guild_role_create(role: discord.Role):
+    name_index.add(role)
+    group_registry.add_role(role)
 
-    for guild in bot.guilds:
-        await update_event_proposals_list(guild)
-        await update_calendar_task()
+
+@bot.event
+async def on_guild_role_delete(role: discord.Role):
+    name_index.remove(role)
+    group_registry.remove_role(role)
+
+
+@bot.event
+async def on_guild_role_update(before: discord.Role, after: discord.Role):
+    if before.name != after.name:
+        name_index.remove(before)
+        name_index.add(after)
+        group_registry.rename_role(before, after)
+
+
+@bot.event
+async def on_member_update(before: discord.Member, after: discord.Member):
+    if before.roles != after.roles:
+        group_registry.update_member(after)
 
 
 @bot.event
 async def on_member_join(member):
-    channel = discord.utils.get(member.guild.text_channels, name=WELCOME_CHANNEL_NAME)
+    channel = name_index.text_channel(member.guild, WELCOME_CHANNEL_NAME)
     if channel:
-        reco_channel = discord.utils.get(
-            member.guild.text_channels, name=RECOMMENDERS_CHANNEL_NAME
-        )
+        reco_channel = name_index.text_channel(member.guild, RECOMMENDERS_CHANNEL_NAME)
         embed = discord.Embed(
             title=f"Bienvenue, {member.display_name} !",
             description=f"Ce serveur fonctionne par **cooptation**. Pour participer, tu dois être recommandé par un membre existant.\n\n"
@@ -1227,13 +3785,10 @@ async def on_member_join(member):
 @bot.event
 async def on_member_remove(member):
     """Nettoie une recommandation en attente si le membre quitte le serveur."""
-    data = load_data(recommendations_db)
-    server_id = str(member.guild.id)
-    member_id_str = str(member.id)
-
-    if server_id in data and member_id_str in data[server_id]:
-        del data[server_id][member_id_str]
-        save_data(data, recommendations_db)
+    group_registry.set_member(member)
+    async with store.transaction(member.guild.id) as data:
+        removed = data.remove_recommendation(member.guild.id, member.id)
+    if removed:
         await log_action(
             member.guild,
             "Nettoyage de Recommandation",
@@ -1244,55 +3799,74 @@ async def on_member_remove(member):
 
 @bot.event
 async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
-    if payload.user_id == bot.user.id:
+    if payload.user_id == bot.user.id or payload.guild_id is None:
         return
+    # Filtre sans appel à l'API : seuls les votes ouverts nous intéressent
+    emoji = str(payload.emoji)
+    if emoji not in quorum_tracker.emojis:
+        return
+    await store.warm(payload.guild_id)
+    tracked = store.get_entry(payload.guild_id, OPEN_VOTES, str(payload.message_id))
     guild = bot.get_guild(payload.guild_id)
     if not guild:
         return
     channel = guild.get_channel(payload.channel_id)
     if not channel:
         return
-    try:
-        message = await channel.fetch_message(payload.message_id)
-    except discord.NotFound:
-        return
-    if not (message.author == bot.user and message.embeds):
+    if not tracked:
+        # Vote ouvert avant le registre : on vérifie le message une seule fois
+        is_vote_channel = channel.name == ANNONCES_CHANNEL_NAME or (
+            channel.name.startswith("🔒-gestion-")
+        )
+        if not (is_vote_channel and await backfill_vote(channel, payload.message_id)):
+            return
+    tally = await quorum_tracker.get(channel, payload.message_id)
+    if tally is None or tally.decided:
         return
+    if not (payload.member and payload.member.bot):
+        tally.voters.setdefault(emoji, set()).add(payload.user_id)
 
-    embed = message.embeds[0]
+    message = tally.message
+    embed = tally.embed
 
-    if channel.name == ANNONCES_CHANNEL_NAME and str(payload.emoji) == "✅":
-        member_role = discord.utils.get(guild.roles, name=MEMBER_ROLE_NAME)
+    if channel.name == ANNONCES_CHANNEL_NAME and emoji == "✅":
+        member_role = name_index.role(guild, MEMBER_ROLE_NAME)
         if not member_role:
             return
 
         total_members = len(member_role.members)
         majority_needed = (total_members // 2) + 1
 
-        reaction = discord.utils.get(message.reactions, emoji="✅")
-        if not (reaction and reaction.count >= majority_needed):
+        if tally.count("✅") < majority_needed:
             return
 
         if embed.title == "Nouvelle recommandation de membre":
             member_id_str = embed.footer.text.split(": ")[1]
-            data = load_data(recommendations_db)
-            server_id = str(guild.id)
-            info = data.get(server_id, {}).get(member_id_str)
+            new_member = guild.get_member(int(member_id_str))
+            async with store.transaction(guild.id) as data:
+                info = data.get_recommendation(guild.id, member_id_str)
+                recommender = info and guild.get_member(info["recommender_id"])
+                if new_member and recommender:
+                    # Retirée avant les appels à l'API : une réaction concurrente
+                    # ne peut plus valider la même recommandation.
+                    data.remove_recommendation(guild.id, member_id_str)
             if not info:
                 return
 
-            new_member = guild.get_member(int(member_id_str))
-            recommender = guild.get_member(info["recommender_id"])
-
             if new_member and recommender:
-                await new_member.add_roles(member_role)
+                tally.decided = True
+                try:
+                    await new_member.add_roles(member_role)
+                except discord.HTTPException:
+                    tally.decided = False
+                    async with store.transaction(guild.id) as data:
+                        data.add_recommendation(guild.id, member_id_str, info)
+                    raise
                 await channel.send(
                     f"🎉 La recommandation pour {new_member.mention} a été validée !"
                 )
 
-                registre_channel = discord.utils.get(
-                    guild.text_channels, name=REGISTRE_CHANNEL_NAME
-                )
+                registre_channel = name_index.text_channel(guild, REGISTRE_CHANNEL_NAME)
                 if registre_channel:
                     await registre_channel.send(
                         f"👋 Bienvenue à {new_member.mention}, qui a rejoint sur recommandation de {recommender.mention}."
@@ -1306,25 +3880,14 @@ async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
                 )
                 await message.delete()
 
-                del data[server_id][member_id_str]
-                save_data(data, recommendations_db)
-
         elif embed.title == "Vote d'exclusion":
             member_id_str = embed.footer.text.split(": ")[1]
             member_to_kick = guild.get_member(int(member_id_str))
+            tally.decided = True
 
             if member_to_kick:
                 try:
                     await member_to_kick.kick(reason="Exclu par vote de la communauté.")
-                    await channel.send(
-                        f"✅ Le vote est terminé. {member_to_kick.mention} a été exclu."
-                    )
-                    await log_action(
-                        guild,
-                        "Membre Exclu",
-                        f"{member_to_kick.mention} a été exclu par vote.",
-                        color=discord.Color.red(),
-                    )
                 except discord.Forbidden:
                     await channel.send(
                         f"❌ Je n'ai pas la permission d'exclure {member_to_kick.mention}."
@@ -1335,33 +3898,31 @@ async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
                         f"Tentative d'exclusion de {member_to_kick.mention} échouée.",
                         color=discord.Color.orange(),
                     )
+                except discord.HTTPException:
+                    tally.decided = False  # Erreur passagère : le vote reste ouvert
+                    raise
+                else:
+                    await channel.send(
+                        f"✅ Le vote est terminé. {member_to_kick.mention} a été exclu."
+                    )
+                    await log_action(
+                        guild,
+                        "Membre Exclu",
+                        f"{member_to_kick.mention} a été exclu par vote.",
+                        color=discord.Color.red(),
+                    )
             await message.delete()
 
     if channel.name.startswith("🔒-gestion-"):
-        group_name_slug = channel.name[len("🔒-gestion-") :]
-        group_role = discord.utils.find(
-            lambda r: r.name[7:].lower().replace(" ", "-") == group_name_slug,
-            guild.roles,
-        )
+        group_role = group_registry.group_of_channel(channel)
         if not group_role or not group_role.members:
             return
 
         member_count = len(group_role.members)
         majority_needed = (member_count // 2) + 1
 
-        yes_reac = discord.utils.get(message.reactions, emoji="✅")
-        no_reac = discord.utils.get(message.reactions, emoji="❌")
-
-        voters_yes = (
-            [user async for user in yes_reac.users() if not user.bot]
-            if yes_reac
-            else []
-        )
-        voters_no = (
-            [user async for user in no_reac.users() if not user.bot] if no_reac else []
-        )
-
-        if str(payload.emoji) == "✅" and len(voters_yes) >= majority_needed:
+        if emoji == "✅" and tally.count("✅") >= majority_needed:
+            tally.decided = True
             event_title = embed.title[len("Nouvelle proposition : ") :]
             category_field = discord.utils.get(embed.fields, name="Catégorie")
             date_field = discord.utils.get(embed.fields, name="Date proposée")
@@ -1370,42 +3931,56 @@ async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
             event_date_str = date_field.value if date_field else None
 
             event_date_iso = None
+            invalid_date = False
             if event_date_str:
                 try:
                     event_date_iso = datetime.strptime(
                         event_date_str, "%d/%m/%Y"
                     ).isoformat()
                 except ValueError:
-                    await channel.send(
-                        "Date invalide dans la proposition, elle ne sera pas ajoutée au calendrier.",
-                        delete_after=30,
-                    )
-
-            events_data = load_data(events_db)
-            server_id = str(guild.id)
-            if server_id not in events_data:
-                events_data[server_id] = {}
+                    invalid_date = True
 
             event_id = str(message.id)
-            events_data[server_id][event_id] = {
-                "title": event_title,
-                "category": event_category,
-                "proposer_group": group_role.name,
-                "ratings": {},
-                "average_rating": 0.0,
-                "status": "active",
-                "date": event_date_iso,
-            }
-            save_data(events_data, events_db)
+            try:
+                async with store.transaction(guild.id) as data:
+                    already_added = data.get_event(guild.id, event_id) is not None
+                    if not already_added:
+                        data.add_event(
+                            guild.id,
+                            event_id,
+                            {
+                                "title": event_title,
+                                "category": event_category,
+                                "proposer_group": group_role.name,
+                                "ratings": {},
+                                "average_rating": 0.0,
+                                "rating_sum": 0,
+                                "rating_count": 0,
+                                "status": "active",
+                                "date": event_date_iso,
+                            },
+                        )
+            except sqlite3.OperationalError:
+                tally.decided = False  # Base occupée : une prochaine réaction réessaie
+                raise
+            if already_added:
+                return  # Déjà validée par une réaction concurrente
+
+            if invalid_date:
+                await channel.send(
+                    "Date invalide dans la proposition, elle ne sera pas ajoutée au calendrier.",
+                    delete_after=30,
+                )
 
             await channel.send(
                 f'✅ La proposition "{event_title}" a été validée par le groupe et est maintenant visible par tous !',
                 delete_after=60,
             )
-            await update_event_proposals_list(guild)
+            refresh_scheduler.mark(guild, "proposals")
             await message.delete()
 
-        elif str(payload.emoji) == "❌" and len(voters_no) >= majority_needed:
+        elif emoji == "❌" and tally.count("❌") >= majority_needed:
+            tally.decided = True
             await channel.send(
                 f'La proposition "{embed.title[len("Nouvelle proposition : ") :]}" a été rejetée.',
                 delete_after=60,
@@ -1413,11 +3988,50 @@ async def on_raw_reaction_add(payload: discord.RawReactionActionEvent):
             await message.delete()
 
 
+@bot.event
+async def on_raw_reaction_remove(payload: discord.RawReactionActionEvent):
+    tally = await quorum_tracker.peek(payload.message_id)
+    if tally is not None:
+        tally.voters.get(str(payload.emoji), set()).discard(payload.user_id)
+
+
+@bot.event
+async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent):
+    quorum_tracker.forget(payload.message_id)
+    if payload.guild_id is not None:
+        await store.warm(payload.guild_id)
+        message_key = str(payload.message_id)
+        if store.get_entry(payload.guild_id, OPEN_VOTES, message_key):
+            store.delete_entry(payload.guild_id, OPEN_VOTES, message_key)
+        pointers = store.entries(payload.guild_id, MESSAGE_POINTERS)
+        for purpose, pointer in pointers.items():
+            if pointer["message_id"] == payload.message_id:
+                store.delete_entry(payload.guild_id, MESSAGE_POINTERS, purpose)
+
+
 # --- Démarrage du Bot ---
 if __name__ == "__main__":
-    if TOKEN is None:
+    if sys.argv[1:] == ["migrate-sqlite"]:
+        migrate_json_to_sqlite(SQLITE_DB_PATH)
+    elif sys.argv[1:] == ["migrate-shards"]:
+        migrate_json_to_shards(DATA_DIR)
+    elif TOKEN is None:
         print(
             "Erreur : Le token Discord n'est pas défini. Veuillez créer un fichier .env avec DISCORD_TOKEN=votretokendeconnexion"
         )
     else:
-        bot.run(TOKEN)
+        try:
+            bot.run(TOKEN)
+        finally:
+            io_executor.shutdown(wait=True)  # Termine les écritures en cours
+            ballot_buffer.flush()
+            store.flush()  # Écrit les dernières modifications avant de quitter
+            skipped = sum(
+                count
+                for (_, kind), count in embed_update_stats.items()
+                if kind == "skipped"
+            )
+            print(
+                f"Mises à jour d'embeds : {skipped} évitée(s) sur "
+                f"{sum(embed_update_stats.values())}."
+            )